@@ -0,0 +1,76 @@
+import mmap
+
+from Compression_algorithms import Container
+from Compression_algorithms.Arithmetic import ArithmeticCoding
+from Compression_algorithms.BWT import BWT
+from Compression_algorithms.BWT_blocks import BlockBWT
+from Compression_algorithms.Huffman2 import HuffmanCoding
+from Compression_algorithms.LZ77 import LZ77
+
+
+# Идентификатор алгоритма в контейнере -> класс алгоритма
+ALGORITHMS = {cls.container_id: cls for cls in (HuffmanCoding, LZ77, BWT, BlockBWT, ArithmeticCoding)}
+
+
+def create_archive(algorithm, data, block_size=None):
+    """
+    Сжатие данных в контейнер блоками
+
+    Args:
+        algorithm (CompressionAlgorithm): Алгоритм сжатия
+        data (str): Исходные данные
+        block_size (int): Размер блока (по умолчанию - stream_block_size алгоритма)
+
+    Returns:
+        bytes: Контейнер
+    """
+    compressor = algorithm.compressor(block_size)
+    return compressor.feed(data) + compressor.flush()
+
+
+class Archive:
+    """Контейнер любого алгоритма: алгоритм и его параметры восстанавливаются из заголовка"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes | bytearray | mmap): Данные контейнера
+        """
+        self.reader = Container.ContainerReader(data)
+        if self.reader.algorithm_id not in ALGORITHMS:
+            raise ValueError(f"Неизвестный алгоритм в контейнере: {self.reader.algorithm_id}")
+        self.algorithm = ALGORITHMS[self.reader.algorithm_id](**self.reader.params)
+
+    @classmethod
+    def open(cls, filename):
+        """Контейнер из файла, отображенного в память: блоки читаются с диска по мере обращения"""
+        with open(filename, 'rb') as file:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                data = b""
+        return cls(data)
+
+    def __len__(self):
+        return len(self.reader)
+
+    def read_block(self, number):
+        """
+        Распаковка одного блока без чтения остальных
+
+        Args:
+            number (int): Номер блока
+
+        Returns:
+            str: Данные блока
+        """
+        algorithm = self.algorithm
+        return algorithm.decompress_data(algorithm.from_bytes(self.reader.block(number)))
+
+    def read(self):
+        """
+        Returns:
+            str: Все данные контейнера
+        """
+        parts = [self.read_block(number) for number in range(len(self))]
+        return ''.join(parts) if self.reader.is_text else b''.join(parts)
@@ -1,132 +1,210 @@
 import sys
-from collections import Counter
-from decimal import Decimal, getcontext
-import math
-from sys import getsizeof
-import pickle
+from array import array
+from bisect import bisect_right
 
 from Compression_algorithms import Super
+from Compression_algorithms import Range_coder
+from Compression_algorithms import Context_model
+from Compression_algorithms import Serialization
+from Compression_algorithms import Statistics
 
 class ArithmeticCoding(Super.CompressionAlgorithm):
-    def __init__(self, name = 'Arithmetic', precision=50):
-        super().__init__("Arithmetic Coding")
+    container_id = 5
+
+    def __init__(self, name = 'Arithmetic', adaptive=False, order=2, max_contexts=1 << 16):
+        super().__init__(f"Arithmetic Coding (PPM order-{order})" if adaptive else "Arithmetic Coding")
         """
         Args:
-            precision (int): Точность вычислений (количество знаков после запятой)
+            adaptive (bool): Адаптивная контекстная модель вместо статической таблицы частот
+            order (int): Максимальный порядок контекста адаптивной модели
+            max_contexts (int): Ограничение памяти модели (число контекстов)
         """
-        getcontext().prec = precision
-        self.precision = precision
+        self.adaptive = adaptive
+        self.order = order
+        self.max_contexts = max_contexts
 
     def compress(self, text):
         """
         Args:
-            text (str): Исходный текст
+            text (str | bytes | bytearray | memoryview): Исходный текст или байты
 
         Returns:
-            tuple: (код, таблица вероятностей, длина)
+            tuple: (закодированные байты, таблица частот или None для адаптивной модели, длина,
+                    признак текста)
         """
+        is_text = isinstance(text, str)
         if not text:
-            return None, {}, 0
+            return b"", {}, 0, is_text
 
-        probabilities = self._calculate_probabilities(text)
-        cumulative_probs = self._create_cumulative_table(probabilities)
+        if self.adaptive:
+            return self._compress_adaptive(text, is_text), None, len(text), is_text
 
-        low = Decimal('0')
-        high = Decimal('1')
+        frequencies = self._calculate_probabilities(text)
+        cumulative_freqs, total = self._create_cumulative_table(frequencies)
 
+        encoder = Range_coder.RangeEncoder()
         for symbol in text:
-            range_size = high - low
-            symbol_low, symbol_high = cumulative_probs[symbol]
-
-            high = low + range_size * symbol_high
-            low = low + range_size * symbol_low
-
-        code = (low + high) / 2
+            start, freq = cumulative_freqs[symbol]
+            encoder.encode(start, freq, total)
 
-        return Decimal(code), probabilities, len(text)
+        return encoder.finish(), frequencies, len(text), is_text
 
     def decompress(self, encoded_data):
-        code, probabilities, length = encoded_data
+        code, frequencies, length, is_text = encoded_data
         """
         Args:
-            code (float): Арифметический код
-            probabilities (dict): Таблица вероятностей символов
+            code (bytes): Закодированные байты
+            frequencies (dict): Таблица целочисленных частот символов
             length (int): Длина исходного текста
+            is_text (bool): Исходные данные были строкой
 
         Returns:
-            str: Восстановленный текст
+            str | bytes: Восстановленный текст или байты
         """
         if length == 0:
-            return ""
+            return "" if is_text else b""
 
-        code = Decimal(str(code))
-        cumulative_probs = self._create_cumulative_table(probabilities)
+        if frequencies is None:
+            return self._decompress_adaptive(code, length, is_text)
 
-        intervals = []
-        for symbol, (low, high) in cumulative_probs.items():
-            intervals.append((low, high, symbol))
-        intervals.sort()
+        cumulative_freqs, total = self._create_cumulative_table(frequencies)
 
+        symbols, starts, lookup = self._build_symbol_lookup(cumulative_freqs, total)
+
+        decoder = Range_coder.RangeDecoder(code)
         result = []
 
         for _ in range(length):
-            symbol = self._find_symbol(code, intervals)
+            value = decoder.get_freq(total)
+            if lookup is not None:
+                index = lookup[value]
+            else:
+                index = self._find_symbol(value, starts)
+            symbol = symbols[index]
             result.append(symbol)
 
-            symbol_low, symbol_high = cumulative_probs[symbol]
-            range_size = symbol_high - symbol_low
-            code = (code - symbol_low) / range_size
+            start, freq = cumulative_freqs[symbol]
+            decoder.decode(start, freq)
+
+        return ''.join(result) if is_text else bytes(result)
+
+    def _create_model(self, is_text):
+        return Context_model.PPMModel(self.order, self.max_contexts, text_mode=is_text)
 
-        return ''.join(result)
+    def _compress_adaptive(self, text, is_text):
+        """Кодирование с адаптивной контекстной моделью: таблица частот не передается"""
+        model = self._create_model(is_text)
+        encoder = Range_coder.RangeEncoder()
+        for symbol in text:
+            model.encode(encoder, symbol)
+        return encoder.finish()
+
+    def _decompress_adaptive(self, code, length, is_text):
+        model = self._create_model(is_text)
+        decoder = Range_coder.RangeDecoder(code)
+        symbols = [model.decode(decoder) for _ in range(length)]
+        return ''.join(symbols) if is_text else bytes(symbols)
 
     @staticmethod
     def _calculate_probabilities(text):
-        """Вычисление вероятностей символов"""
-        counter = Counter(text)
+        """Целочисленные частоты символов, масштабированные под сумму не больше MAX_TOTAL"""
+        counter = Statistics.histogram(text)
         total = len(text)
 
-        probabilities = {}
+        limit = Range_coder.MAX_TOTAL - len(counter)
+        if total <= limit:
+            return dict(counter)
+
+        # Каждая частота остается ненулевой, сумма не превышает MAX_TOTAL
+        frequencies = {}
         for char, count in counter.items():
-            probabilities[char] = Decimal(count) / Decimal(total)
+            frequencies[char] = max(1, count * limit // total)
 
-        return probabilities
+        return frequencies
 
     @staticmethod
-    def _create_cumulative_table(probabilities):
-        """Создание кумулятивной таблицы вероятностей"""
-        cumulative_probs = {}
-        cumulative = Decimal('0')
-
-        for symbol in sorted(probabilities.keys()):
-            prob = probabilities[symbol]
-            cumulative_probs[symbol] = (cumulative, cumulative + prob)
-            cumulative += prob
+    def _create_cumulative_table(frequencies):
+        """
+        Создание кумулятивной таблицы частот
 
-        return cumulative_probs
+        Returns:
+            tuple: (символ -> (накопленная частота, частота), сумма частот)
+        """
+        cumulative_freqs = {}
+        cumulative = 0
 
-    @staticmethod
-    def _find_symbol(code, intervals):
-        """Поиск символа по коду в интервалах"""
-        for low, high, symbol in intervals:
-            if low <= code < high:
-                return symbol
+        for symbol in sorted(frequencies.keys()):
+            freq = frequencies[symbol]
+            cumulative_freqs[symbol] = (cumulative, freq)
+            cumulative += freq
 
-        return intervals[-1][2]
+        return cumulative_freqs, cumulative
 
     @staticmethod
-    def get_encoded_size(compressed_data):
-        code, probabilities, text = compressed_data
+    def _build_symbol_lookup(cumulative_freqs, total, lookup_limit=Range_coder.MAX_TOTAL):
         """
         Args:
-            code (float): число, представляющее диапазон
-            probabilities: таблица вероятностей 
-            text_length (int): длина исходного текста
+            cumulative_freqs (dict): Символ -> (накопленная частота, частота)
+            total (int): Сумма частот
+            lookup_limit (int): Максимальная сумма частот для прямой таблицы
 
         Returns:
-            int: размер в битах
+            tuple: (символы по порядку, начала интервалов array('I'),
+                    прямая таблица накопленная частота -> номер символа или None)
         """
-        return (getsizeof(str(abs(code))) + getsizeof(str(probabilities.keys())) + getsizeof(str(probabilities.values))
-                + getsizeof(text))
+        symbols = list(cumulative_freqs)
+        starts = array('I', [cumulative_freqs[symbol][0] for symbol in symbols])
+
+        lookup = None
+        if total <= lookup_limit:
+            lookup = array('I' if len(symbols) > 0xFFFF else 'H', [0]) * total
+            for index, symbol in enumerate(symbols):
+                start, freq = cumulative_freqs[symbol]
+                lookup[start:start + freq] = array(lookup.typecode, [index]) * freq
+
+        return symbols, starts, lookup
+
+    @staticmethod
+    def _find_symbol(value, starts):
+        """Поиск номера символа по накопленной частоте двоичным поиском"""
+        return bisect_right(starts, value) - 1
+
+    def get_params(self):
+        return {'adaptive': self.adaptive, 'order': self.order, 'max_contexts': self.max_contexts}
+
+    def to_bytes(self, compressed_data):
+        """Длина, флаги (адаптивная модель, текст), таблица частот (только для статической модели) и закодированные байты"""
+        code, frequencies, length, is_text = compressed_data
+        buffer = bytearray()
+        Serialization.write_varint(buffer, length)
+        buffer.append((1 if frequencies is None else 0) | (2 if is_text else 0))
+        if frequencies is not None:
+            Serialization.write_varint(buffer, len(frequencies))
+            for char in sorted(frequencies):
+                Serialization.write_varint(buffer, Serialization.symbol_to_int(char))
+                Serialization.write_varint(buffer, frequencies[char])
+        buffer += code
+        return bytes(buffer)
+
+    def from_bytes(self, data):
+        length, pos = Serialization.read_varint(data, 0)
+        flags = data[pos]
+        adaptive, is_text = bool(flags & 1), bool(flags & 2)
+        pos += 1
+        frequencies = None
+        if not adaptive:
+            frequencies = {}
+            symbol_count, pos = Serialization.read_varint(data, pos)
+            for _ in range(symbol_count):
+                code_point, pos = Serialization.read_varint(data, pos)
+                symbol = Serialization.int_to_symbol(code_point, is_text)
+                frequencies[symbol], pos = Serialization.read_varint(data, pos)
+        return data[pos:], frequencies, length, is_text
+
+    @staticmethod
+    def get_encoded_size(compressed_data):
+        """Размер в битах: таблица частот (для статической модели) и закодированные байты"""
+        return len(ArithmeticCoding().to_bytes(compressed_data)) * 8
 
 if __name__ == '__main__':
     arithmetic_codding = ArithmeticCoding()
@@ -138,8 +216,4 @@ if __name__ == '__main__':
     with open('Original_text.txt', 'r+') as f:
         text = f.read()
 
-    with open('Arithmetic_compressed.txt', 'w+') as f:
-        f.write(str(arithmetic_codding.compress(text)))
-
-    with open('Arithmetic_compressed.bin', 'w+') as f:
-        f.write(pickle.dumps(arithmetic_codding.compress(text)))
+    arithmetic_codding.save_compressed(arithmetic_codding.compress(text), len(text), 'Arithmetic_compressed.bin')
@@ -1,86 +1,77 @@
 import sys
+from array import array
 
 from Compression_algorithms import Super
+from Compression_algorithms import Serialization
+from Compression_algorithms import Suffix_array
 
 
 class BWT(Super.CompressionAlgorithm):
-    def __init__(self, end_marker='$'):
+    container_id = 3
+
+    def __init__(self):
         super().__init__('BWT')
-        self.end_marker = end_marker
 
     def compress(self, text):
-        if not text:
-            return "", 0
-
-        text_with_marker = text + self.end_marker
-        n = len(text_with_marker)
-
-        # Создаем индексы
-        rotations_indices = list(range(n))
-
-        # Сортируем индексы
-        rotations_indices.sort(key=lambda i: text_with_marker[i:] + text_with_marker[:i])
+        """
+        Преобразование с виртуальным сентинелом: конец строки считается меньше любого символа,
+        поэтому никакой символ алфавита не резервируется под маркер
 
-        # Находим индекс оригинальной строки
-        original_index = rotations_indices.index(0)
+        Args:
+            text (str | bytes | bytearray | memoryview): Исходные данные
 
-        # Создаем BWT строку, используя индексы
-        bwt_chars = []
-        for i in rotations_indices:
-            prev_index = (i - 1) % n
-            bwt_chars.append(text_with_marker[prev_index])
+        Returns:
+            tuple: (BWT строка той же длины, что и вход, номер строки сентинела)
+        """
+        if not text:
+            return ("" if isinstance(text, str) else b""), 0
 
-        return ''.join(bwt_chars), original_index
+        n = len(text)
+        suffix_array = self._build_suffix_array(text)
+
+        # Строка 0 матрицы - суффикс из одного сентинела, ей предшествует последний символ.
+        # Строке суффикса 0 предшествует сентинел: он не выводится, запоминается только его номер
+        original_index = 0
+        bwt_chars = [text[n - 1]]
+        for row, i in enumerate(suffix_array, 1):
+            if i == 0:
+                original_index = row
+            else:
+                bwt_chars.append(text[i - 1])
+
+        if isinstance(text, str):
+            return ''.join(bwt_chars), original_index
+        return bytes(bwt_chars), original_index
 
     def decompress(self, bwt_string, original_index):
+        """
+        Args:
+            bwt_string (str | bytes): BWT строка без сентинела
+            original_index (int): Номер строки сентинела
+
+        Returns:
+            str | bytes: Восстановленные данные того же типа, что bwt_string
+        """
         if not bwt_string:
-            return ""
+            return bwt_string[:0]
 
         n = len(bwt_string)
 
-        # Создаем отсортированную первую колонку (F)
-        f_column = sorted(bwt_string)
-
-        # Создаем таблицу преобразования
-        transform_table = {}
-        for char in set(bwt_string):
-            transform_table[char] = []
+        # LF-отображение: позиция i BWT строки -> строка матрицы, начинающаяся с символа bwt_string[i]
+        lf_mapping = self._build_transform_table(bwt_string)
 
-        # Заполняем таблицу преобразования
-        for char in bwt_string:
-            transform_table[char].append(len(transform_table[char]))
-
-        # Создаем массив следующих индексов
-        next_indices = [0] * n
-        char_counts = {char: 0 for char in set(bwt_string)}
-
-        for i in range(n):
-            char = bwt_string[i]
-            count = char_counts[char]
-            char_counts[char] += 1
-
-            # Находим позицию в F колонке
-            pos = 0
-            for c in sorted(char_counts.keys()):
-                if c < char:
-                    pos += char_counts[c]
-                elif c == char:
-                    pos += count
-                    break
-
-            next_indices[i] = pos
+        # Строка 0 начинается с сентинела, ее последний символ - последний символ текста.
+        # Каждый шаг LF восстанавливает предыдущий символ текста
+        result = [None] * n
+        row = 0
+        for pos in range(n - 1, -1, -1):
+            i = row if row < original_index else row - 1
+            result[pos] = bwt_string[i]
+            row = lf_mapping[i]
 
-        # Восстанавливаем исходную строку
-        result = []
-        current_index = original_index
-
-        for _ in range(n - 1):  # минус 1, так как не включаем маркер
-            current_index = next_indices[current_index]
-            if bwt_string[current_index] == self.end_marker:
-                break
-            result.append(bwt_string[current_index])
-
-        return ''.join(reversed(result))
+        if isinstance(bwt_string, str):
+            return ''.join(result)
+        return bytes(result)
 
     @staticmethod
     def _build_suffix_array(text):
@@ -89,51 +80,56 @@ class BWT(Super.CompressionAlgorithm):
             text (str): Входная строка
 
         Returns:
-            list: Суффиксный массив
+            array: Суффиксный массив
         """
-        n = len(text)
-
-        suffixes = []
-        for i in range(n):
-            suffixes.append((text[i:], i))
-
-        suffixes.sort(key=lambda x: x[0])
-
-        return [suffix[1] for suffix in suffixes]
+        return Suffix_array.build_suffix_array(text)
 
     @staticmethod
     def _build_transform_table(bwt_string):
         """
         Args:
-            bwt_string (str): BWT строка
+            bwt_string (str | bytes): BWT строка без сентинела
 
         Returns:
-            list: Таблица преобразований
+            array: LF-отображение (array('I')), transform_table[i] = C[c] + occ(c, i), c = bwt_string[i]
         """
-        n = len(bwt_string)
         char_counts = {}
         for char in bwt_string:
             char_counts[char] = char_counts.get(char, 0) + 1
 
-        sorted_chars = sorted(char_counts.keys())
-        char_starts = {}
-        pos = 0
-        for char in sorted_chars:
-            char_starts[char] = pos
+        # C-массив: позиция первого вхождения символа в первой колонке (строка 0 - сентинел)
+        char_positions = {}
+        pos = 1
+        for char in sorted(char_counts):
+            char_positions[char] = pos
             pos += char_counts[char]
 
-        transform_table = [0] * n
-        char_positions = char_starts.copy()
-
-        for i in range(n):
-            char = bwt_string[i]
+        transform_table = array('I', [0]) * len(bwt_string)
+        for i, char in enumerate(bwt_string):
             transform_table[i] = char_positions[char]
             char_positions[char] += 1
 
         return transform_table
 
+    def decompress_data(self, compressed_data):
+        return self.decompress(*compressed_data)
+
+    def to_bytes(self, compressed_data):
+        bwt_string, original_index = compressed_data
+        buffer = bytearray()
+        is_text = isinstance(bwt_string, str)
+        buffer.append(is_text)
+        Serialization.write_varint(buffer, original_index)
+        buffer += bwt_string.encode('utf-8') if is_text else bwt_string
+        return bytes(buffer)
+
+    def from_bytes(self, data):
+        is_text = data[0]
+        original_index, pos = Serialization.read_varint(data, 1)
+        bwt_string = bytes(data[pos:])
+        return (bwt_string.decode('utf-8') if is_text else bwt_string), original_index
+
     @staticmethod
     def get_encoded_size(encoded_data):
         bwt_string, original_index = encoded_data
         return len(bwt_string) * 8 + sys.getsizeof(original_index)
-
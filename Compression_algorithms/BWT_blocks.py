@@ -0,0 +1,209 @@
+from Compression_algorithms import Super
+from Compression_algorithms import Serialization
+from Compression_algorithms.BWT import BWT
+from Compression_algorithms.Huffman2 import HuffmanCoding
+
+
+# Символы после кодирования нулевых серий: RUNA/RUNB кодируют длину серии нулей
+# в биективной двоичной системе, ненулевой индекс MTF v становится символом v + 1
+RUNA = 0
+RUNB = 1
+
+
+def move_to_front(sequence, alphabet):
+    """
+    Args:
+        sequence (str): Последовательность символов
+        alphabet (list): Начальный порядок символов
+
+    Returns:
+        list: Индексы символов в таблице MTF
+    """
+    table = list(alphabet)
+    result = []
+    for char in sequence:
+        index = table.index(char)
+        result.append(index)
+        if index:
+            del table[index]
+            table.insert(0, char)
+    return result
+
+
+def inverse_move_to_front(indices, alphabet):
+    """
+    Args:
+        indices (list): Индексы MTF
+        alphabet (list): Начальный порядок символов
+
+    Returns:
+        list: Восстановленные символы
+    """
+    table = list(alphabet)
+    result = []
+    for index in indices:
+        char = table[index]
+        result.append(char)
+        if index:
+            del table[index]
+            table.insert(0, char)
+    return result
+
+
+def zero_run_encode(indices):
+    """
+    Args:
+        indices (list): Индексы MTF
+
+    Returns:
+        list: Символы RUNA/RUNB для серий нулей и v + 1 для остальных значений
+    """
+    result = []
+    run = 0
+    for index in indices:
+        if index == 0:
+            run += 1
+            continue
+        if run:
+            _emit_run(run, result)
+            run = 0
+        result.append(index + 1)
+    if run:
+        _emit_run(run, result)
+    return result
+
+
+def _emit_run(run, result):
+    """Запись длины серии нулей в биективной двоичной системе (цифры 1 = RUNA, 2 = RUNB)"""
+    while run > 0:
+        if run & 1:
+            result.append(RUNA)
+            run = (run - 1) >> 1
+        else:
+            result.append(RUNB)
+            run = (run - 2) >> 1
+
+
+def zero_run_decode(symbols):
+    """
+    Args:
+        symbols (list): Результат zero_run_encode
+
+    Returns:
+        list: Индексы MTF
+    """
+    result = []
+    run = 0
+    weight = 1
+    for symbol in symbols:
+        if symbol == RUNA or symbol == RUNB:
+            run += weight << symbol
+            weight <<= 1
+            continue
+        if run:
+            result.extend([0] * run)
+            run = 0
+            weight = 1
+        result.append(symbol - 1)
+    if run:
+        result.extend([0] * run)
+    return result
+
+
+class BlockBWT(Super.CompressionAlgorithm):
+    """Блочный конвейер в стиле bzip2: BWT -> MTF -> RLE нулей -> Хаффман"""
+
+    container_id = 4
+
+    def __init__(self, block_size=100000):
+        super().__init__("BWT Blocks")
+        """
+        Args:
+            block_size (int): Размер блока в символах; память ограничена размером блока
+        """
+        self.block_size = block_size
+        self.stream_block_size = block_size
+        self.bwt = BWT()
+        self.huffman = HuffmanCoding()
+
+    def compress(self, text):
+        """
+        Args:
+            text (str | bytes | bytearray | memoryview): Исходный текст или байты
+
+        Returns:
+            tuple: (независимые блоки (original_index, alphabet, huffman_data), признак текста)
+        """
+        blocks = []
+        for start in range(0, len(text), self.block_size):
+            blocks.append(self.compress_block(text[start:start + self.block_size]))
+        return blocks, isinstance(text, str)
+
+    def decompress(self, compressed_data):
+        """
+        Args:
+            compressed_data (tuple): Блоки и признак текста, полученные из compress
+
+        Returns:
+            str | bytes: Восстановленный текст или байты
+        """
+        blocks, is_text = compressed_data
+        parts = [self.decompress_block(block) for block in blocks]
+        return ''.join(parts) if is_text else b''.join(parts)
+
+    def compress_block(self, block):
+        """Сжатие одного блока, не зависящее от остальных"""
+        bwt_string, original_index = self.bwt.compress(block)
+        alphabet = sorted(set(bwt_string))
+
+        symbols = zero_run_encode(move_to_front(bwt_string, alphabet))
+        huffman_data = self.huffman.compress(''.join(map(chr, symbols)))
+
+        return original_index, alphabet, huffman_data
+
+    def decompress_block(self, block):
+        """Распаковка одного блока"""
+        original_index, alphabet, huffman_data = block
+
+        symbols = self.huffman.decompress(*huffman_data)
+        indices = zero_run_decode(list(map(ord, symbols)))
+        bwt_chars = inverse_move_to_front(indices, alphabet)
+        bwt_string = ''.join(bwt_chars) if Serialization.is_text_symbols(alphabet) else bytes(bwt_chars)
+
+        return self.bwt.decompress(bwt_string, original_index)
+
+    def get_params(self):
+        return {'block_size': self.block_size}
+
+    def to_bytes(self, compressed_data):
+        blocks, is_text = compressed_data
+        buffer = bytearray()
+        buffer.append(is_text)
+        Serialization.write_varint(buffer, len(blocks))
+        for original_index, alphabet, huffman_data in blocks:
+            Serialization.write_varint(buffer, original_index)
+            Serialization.write_varint(buffer, len(alphabet))
+            for char in alphabet:
+                Serialization.write_varint(buffer, Serialization.symbol_to_int(char))
+            Serialization.write_bytes(buffer, self.huffman.to_bytes(huffman_data))
+        return bytes(buffer)
+
+    def from_bytes(self, data):
+        is_text = bool(data[0])
+        block_count, pos = Serialization.read_varint(data, 1)
+        blocks = []
+        for _ in range(block_count):
+            original_index, pos = Serialization.read_varint(data, pos)
+            alphabet_size, pos = Serialization.read_varint(data, pos)
+            alphabet = []
+            for _ in range(alphabet_size):
+                code_point, pos = Serialization.read_varint(data, pos)
+                alphabet.append(Serialization.int_to_symbol(code_point, is_text))
+            huffman_bytes, pos = Serialization.read_bytes(data, pos)
+            blocks.append((original_index, alphabet, self.huffman.from_bytes(huffman_bytes)))
+        return blocks, is_text
+
+    @staticmethod
+    def get_encoded_size(compressed_data):
+        """Размер в битах сериализованных блоков"""
+        return len(BlockBWT().to_bytes(compressed_data)) * 8
@@ -0,0 +1,191 @@
+import struct
+import zlib
+
+from Compression_algorithms import Serialization
+from Compression_algorithms.Serialization import TruncatedDataError
+
+
+# Формат контейнера:
+#   заголовок: MAGIC | версия (1 байт) | id алгоритма (1 байт) | флаги (1 байт) | параметры
+#   блок:      RECORD_BLOCK | varint исходная длина | varint длина данных | CRC32 данных | данные
+#   конец:     RECORD_END | varint число блоков | (varint смещение записи, varint исходная длина) * n
+#   хвост:     смещение записи конца (8 байт) | END_MAGIC
+MAGIC = b'CALG'
+END_MAGIC = b'CEND'
+VERSION = 2
+
+RECORD_END = 0
+RECORD_BLOCK = 1
+
+# Флаги заголовка
+FLAG_TEXT = 1
+
+CHECKSUM = struct.Struct('>I')
+TRAILER = struct.Struct('>Q4s')
+
+
+def write_header(buffer, algorithm_id, flags, params):
+    """
+    Args:
+        buffer (bytearray): Выходной буфер
+        algorithm_id (int): Идентификатор алгоритма
+        flags (int): Флаги (FLAG_TEXT - исходные данные были строкой)
+        params (dict): Целочисленные параметры алгоритма, нужные для распаковки
+    """
+    buffer += MAGIC
+    buffer.append(VERSION)
+    buffer.append(algorithm_id)
+    buffer.append(flags)
+    Serialization.write_varint(buffer, len(params))
+    for name in sorted(params):
+        Serialization.write_bytes(buffer, name.encode('ascii'))
+        Serialization.write_varint(buffer, int(params[name]))
+
+
+def read_header(data):
+    """
+    Args:
+        data (bytes | memoryview): Данные контейнера
+
+    Returns:
+        tuple: (id алгоритма, флаги, параметры, позиция после заголовка)
+    """
+    if len(data) < len(MAGIC) + 3:
+        raise TruncatedDataError("Неожиданный конец данных")
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Неверная сигнатура контейнера")
+
+    pos = len(MAGIC)
+    version, algorithm_id, flags = data[pos], data[pos + 1], data[pos + 2]
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия контейнера: {version}")
+    pos += 3
+
+    params = {}
+    count, pos = Serialization.read_varint(data, pos)
+    for _ in range(count):
+        name, pos = Serialization.read_bytes(data, pos)
+        params[bytes(name).decode('ascii')], pos = Serialization.read_varint(data, pos)
+
+    return algorithm_id, flags, params, pos
+
+
+def write_block(buffer, raw_length, payload):
+    """
+    Args:
+        buffer (bytearray): Выходной буфер
+        raw_length (int): Длина исходных данных блока
+        payload (bytes): Сжатые данные блока
+    """
+    buffer.append(RECORD_BLOCK)
+    Serialization.write_varint(buffer, raw_length)
+    Serialization.write_varint(buffer, len(payload))
+    buffer += CHECKSUM.pack(zlib.crc32(payload))
+    buffer += payload
+
+
+def read_block(data, pos):
+    """
+    Args:
+        data (memoryview): Данные контейнера
+        pos (int): Позиция записи блока
+
+    Returns:
+        tuple: (исходная длина, данные блока без копирования, позиция следующей записи)
+    """
+    if pos >= len(data):
+        raise TruncatedDataError("Неожиданный конец данных")
+    if data[pos] != RECORD_BLOCK:
+        raise ValueError("Ожидалась запись блока")
+
+    raw_length, pos = Serialization.read_varint(data, pos + 1)
+    payload_length, pos = Serialization.read_varint(data, pos)
+    end = pos + CHECKSUM.size + payload_length
+    if end > len(data):
+        raise TruncatedDataError("Неожиданный конец данных")
+
+    checksum, = CHECKSUM.unpack_from(data, pos)
+    payload = data[pos + CHECKSUM.size:end]
+    if zlib.crc32(payload) != checksum:
+        raise ValueError("Контрольная сумма блока не совпадает")
+
+    return raw_length, payload, end
+
+
+def write_end(buffer, index, end_offset=None):
+    """
+    Args:
+        buffer (bytearray): Выходной буфер
+        index (list): Пары (смещение записи блока, исходная длина)
+        end_offset (int): Смещение записи конца от начала контейнера (по умолчанию - длина buffer)
+    """
+    if end_offset is None:
+        end_offset = len(buffer)
+    buffer.append(RECORD_END)
+    Serialization.write_varint(buffer, len(index))
+    for offset, raw_length in index:
+        Serialization.write_varint(buffer, offset)
+        Serialization.write_varint(buffer, raw_length)
+    buffer += TRAILER.pack(end_offset, END_MAGIC)
+
+
+def read_end(data, pos):
+    """
+    Returns:
+        tuple: (пары (смещение записи блока, исходная длина), позиция после хвоста)
+    """
+    if data[pos] != RECORD_END:
+        raise ValueError("Ожидалась запись конца контейнера")
+    count, pos = Serialization.read_varint(data, pos + 1)
+    index = []
+    for _ in range(count):
+        offset, pos = Serialization.read_varint(data, pos)
+        raw_length, pos = Serialization.read_varint(data, pos)
+        index.append((offset, raw_length))
+
+    if pos + TRAILER.size > len(data):
+        raise TruncatedDataError("Неожиданный конец данных")
+    if TRAILER.unpack_from(data, pos)[1] != END_MAGIC:
+        raise ValueError("Контейнер не завершен")
+    return index, pos + TRAILER.size
+
+
+class ContainerReader:
+    """Чтение контейнера без копирования (memoryview) с произвольным доступом к блокам"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes | bytearray | mmap): Данные контейнера целиком
+        """
+        self.data = memoryview(data)
+        self.algorithm_id, self.flags, self.params, self.blocks_start = read_header(self.data)
+
+        if len(self.data) < self.blocks_start + TRAILER.size:
+            raise TruncatedDataError("Неожиданный конец данных")
+        end_offset, end_magic = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        if end_magic != END_MAGIC:
+            raise ValueError("Контейнер не завершен")
+        self.index, _ = read_end(self.data, end_offset)
+
+    @property
+    def is_text(self):
+        return bool(self.flags & FLAG_TEXT)
+
+    def __len__(self):
+        return len(self.index)
+
+    def block(self, number):
+        """
+        Args:
+            number (int): Номер блока
+
+        Returns:
+            memoryview: Сжатые данные блока (контрольная сумма проверена)
+        """
+        offset, _ = self.index[number]
+        _, payload, _ = read_block(self.data, offset)
+        return payload
+
+    def block_raw_length(self, number):
+        return self.index[number][1]
@@ -0,0 +1,135 @@
+from Compression_algorithms import Range_coder
+
+
+class PPMModel:
+    """
+    Адаптивная контекстная модель PPM (оценка ухода методом C, без исключений).
+
+    Контексты порядков order..0 обновляются после каждого символа одинаково в кодере
+    и декодере, поэтому таблица вероятностей не передается. Новые символы кодируются
+    после ухода в порядок -1 равномерным распределением по кодовой точке.
+    """
+
+    def __init__(self, order=2, max_contexts=1 << 16, text_mode=True):
+        """
+        Args:
+            order (int): Максимальный порядок контекста
+            max_contexts (int): Ограничение числа контекстов; при превышении модель сбрасывается
+            text_mode (bool): True - символы str, False - байты (целые 0..255)
+        """
+        self.order = order
+        self.max_contexts = max_contexts
+        self.text_mode = text_mode
+        # Кодовая точка Unicode (до 0x10FFFF) кодируется тремя частями, байт - одной
+        self.literal_parts = ((16, 0x11), (8, 0x100), (0, 0x100)) if text_mode else ((0, 0x100),)
+        self.contexts = {}
+        self.history = ()
+
+    def reset(self):
+        """Сброс всех контекстов (начало потока или превышение max_contexts)"""
+        self.contexts = {}
+
+    def encode(self, encoder, symbol):
+        """
+        Args:
+            encoder (RangeEncoder): Интервальный кодер
+            symbol: Кодируемый символ
+        """
+        history = self.history
+        for k in range(min(self.order, len(history)), -1, -1):
+            context = self.contexts.get(history[len(history) - k:])
+            if context is None:
+                continue
+
+            counts, total = context
+            if symbol in counts:
+                start = 0
+                for other, count in counts.items():
+                    if other == symbol:
+                        break
+                    start += count
+                encoder.encode(start, counts[symbol], total + len(counts))
+                break
+
+            # Уход в контекст меньшего порядка
+            encoder.encode(total, len(counts), total + len(counts))
+        else:
+            code_point = ord(symbol) if self.text_mode else symbol
+            for shift, part_total in self.literal_parts:
+                encoder.encode((code_point >> shift) & 0xFF, 1, part_total)
+
+        self._update(symbol)
+
+    def decode(self, decoder):
+        """
+        Args:
+            decoder (RangeDecoder): Интервальный декодер
+
+        Returns:
+            Декодированный символ
+        """
+        history = self.history
+        symbol = None
+        for k in range(min(self.order, len(history)), -1, -1):
+            context = self.contexts.get(history[len(history) - k:])
+            if context is None:
+                continue
+
+            counts, total = context
+            value = decoder.get_freq(total + len(counts))
+            if value >= total:
+                decoder.decode(total, len(counts))
+                continue
+
+            start = 0
+            for other, count in counts.items():
+                if value < start + count:
+                    symbol = other
+                    decoder.decode(start, count)
+                    break
+                start += count
+            break
+        else:
+            code_point = 0
+            for shift, part_total in self.literal_parts:
+                part = decoder.get_freq(part_total)
+                decoder.decode(part, 1)
+                code_point |= part << shift
+            symbol = chr(code_point) if self.text_mode else code_point
+
+        self._update(symbol)
+        return symbol
+
+    def _update(self, symbol):
+        """Учет символа во всех контекстах порядков 0..order и сдвиг истории"""
+        history = self.history
+        contexts = self.contexts
+        for k in range(min(self.order, len(history)) + 1):
+            key = history[len(history) - k:]
+            context = contexts.get(key)
+            if context is None:
+                contexts[key] = [{symbol: 1}, 1]
+                continue
+
+            counts = context[0]
+            counts[symbol] = counts.get(symbol, 0) + 1
+            context[1] += 1
+            if context[1] + len(counts) > Range_coder.MAX_TOTAL:
+                self._rescale(context)
+
+        if len(contexts) > self.max_contexts:
+            self.reset()
+
+        history = history + (symbol,)
+        if len(history) > self.order:
+            history = history[1:]
+        self.history = history
+
+    @staticmethod
+    def _rescale(context):
+        counts = context[0]
+        total = 0
+        for symbol in counts:
+            counts[symbol] = (counts[symbol] + 1) >> 1
+            total += counts[symbol]
+        context[1] = total
@@ -1,9 +1,24 @@
-from collections import Counter
 import heapq
 import os
-import pickle
+from bisect import bisect_right
+
+try:
+    import numpy
+except ImportError:  # Без NumPy кодирование идет посимвольно через _pack_bits
+    numpy = None
 
 from Compression_algorithms import Super
+from Compression_algorithms import Serialization
+from Compression_algorithms import Statistics
+
+
+# Векторизованное кодирование: вход обрабатывается порциями по VECTOR_CHUNK символов,
+# чтобы временные массивы помещались в кэш процессора (битовые позиции порции помещаются в uint32)
+VECTOR_CHUNK = 1 << 16
+# Более короткий вход кодируется посимвольно: подготовка таблиц NumPy дороже самого кодирования
+VECTOR_MIN = 1 << 12
+# Код, сдвинутый внутри байта на 0..7 бит, должен помещаться в 32-битное окно
+VECTOR_MAX_CODE_LENGTH = 25
 
 
 class HuffmanNode:
@@ -35,8 +50,20 @@ class HuffmanNode:
 class HuffmanCoding(Super.CompressionAlgorithm):
     """Реализация кодирования Хаффмана"""
 
-    def __init__(self):
+    container_id = 1
+
+    def __init__(self, table_bits=10, max_code_length=15, sync_interval=None):
         super().__init__("Huffman Coding")
+        """
+        Args:
+            table_bits (int): Разрядность первичной таблицы декодирования
+            max_code_length (int | None): Ограничение длины кода (package-merge), None - без ограничения
+            sync_interval (int | None): Шаг точек синхронизации в символах исходных данных
+                (для байтов - в байтах результата распаковки), None - без индекса
+        """
+        self.table_bits = table_bits
+        self.max_code_length = max_code_length
+        self.sync_interval = sync_interval
         self.root = None
         self.codes = {}
         self.reverse_codes = {}
@@ -46,69 +73,381 @@ class HuffmanCoding(Super.CompressionAlgorithm):
         Сжатие текста алгоритмом Хаффмана
 
         Args:
-            text (str): Исходный текст
+            text (str | bytes | bytearray | memoryview): Исходный текст или байты
 
         Returns:
-            tuple: (сжатая битовая строка, дерево кодов, исходная длина)
+            tuple: (упакованные биты, число битов дополнения, длины кодов, исходная длина, точки синхронизации,
+                признак текста). Для байтовых данных символами таблицы являются целые 0..255.
+                Точки синхронизации - пары (смещение в битах, номер символа), с которых можно начать декодирование
         """
+        is_text = isinstance(text, str)
         if not text:
-            return "", {}, 0
+            return b"", 0, {}, 0, [], is_text
+
+        # 1. Подсчет частот за один проход (memoryview читается без копирования)
+        frequencies = Statistics.histogram(text)
 
         # Особый случай: только один уникальный символ
-        if len(set(text)) == 1:
-            char = text[0]
-            return "0" * len(text), {char: "0"}, len(text)
+        if len(frequencies) == 1:
+            code_lengths = {text[0]: 1}
+        else:
+            # 2. Построение дерева Хаффмана
+            self.root = self._build_huffman_tree(frequencies)
 
-        # 1. Подсчет частот
-        frequencies = Counter(text)
+            # 3. Длины кодов из дерева (при необходимости - с ограничением длины)
+            self.codes = {}
+            self.generate_codes(self.root, "")
+            code_lengths = {char: len(code) for char, code in self.codes.items()}
 
-        # 2. Построение дерева Хаффмана
-        self.root = self._build_huffman_tree(frequencies)
+            limit = self.max_code_length
+            if limit and max(code_lengths.values()) > limit and len(code_lengths) <= (1 << limit):
+                code_lengths = self._limit_code_lengths(frequencies, limit)
 
-        # 3. Генерация кодов
-        self.codes = {}
-        self.generate_codes(self.root, "")
+        # 4. Канонические коды восстанавливаются по одним длинам
+        code_table = self.canonical_codes(code_lengths)
+        self.codes = {char: format(code, f'0{length}b') for char, (code, length) in code_table.items()}
+
+        # 5. Кодирование текста в упакованные биты
+        if (numpy is not None and len(text) >= VECTOR_MIN
+                and max(code_lengths.values()) <= VECTOR_MAX_CODE_LENGTH):
+            encoded_bytes, padding = self._pack_bits_vectorised(text, code_table)
+        else:
+            encoded_bytes, padding = self._pack_bits(text, code_table)
+
+        sync_points = self._sync_points(text, code_lengths, self.sync_interval) if self.sync_interval else []
+
+        return encoded_bytes, padding, code_lengths, len(text), sync_points, is_text
+
+    @staticmethod
+    def canonical_codes(code_lengths):
+        """
+        Канонические коды Хаффмана по длинам (как в DEFLATE)
+
+        Args:
+            code_lengths (dict): Длины кодов символов
+
+        Returns:
+            dict: Символ -> (значение кода, длина)
+        """
+        max_length = max(code_lengths.values())
+        length_counts = [0] * (max_length + 1)
+        for length in code_lengths.values():
+            length_counts[length] += 1
+
+        # Первый код каждой длины
+        next_code = [0] * (max_length + 1)
+        code = 0
+        for length in range(1, max_length + 1):
+            next_code[length] = code
+            code = (code + length_counts[length]) << 1
+
+        code_table = {}
+        for char in sorted(code_lengths):
+            length = code_lengths[char]
+            code_table[char] = (next_code[length], length)
+            next_code[length] += 1
+
+        return code_table
+
+    @staticmethod
+    def _limit_code_lengths(frequencies, max_length):
+        """
+        Оптимальные длины кодов не длиннее max_length (алгоритм package-merge)
+
+        Args:
+            frequencies (dict): Частоты символов
+            max_length (int): Максимальная длина кода
+
+        Returns:
+            dict: Длины кодов символов
+        """
+        leaves = sorted((freq, [char]) for char, freq in frequencies.items())
+        items = leaves
+        for _ in range(max_length - 1):
+            # Объединяем соседние пары в пакеты и сливаем их с листьями
+            packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                        for i in range(0, len(items) - 1, 2)]
+            items = sorted(leaves + packages, key=lambda item: item[0])
+
+        code_lengths = dict.fromkeys(frequencies, 0)
+        for _, chars in items[:2 * len(leaves) - 2]:
+            for char in chars:
+                code_lengths[char] += 1
+
+        return code_lengths
+
+    @staticmethod
+    def _pack_bits(text, code_table):
+        """
+        Args:
+            text (str): Исходный текст
+            code_table (dict): Символ -> (значение кода, длина)
+
+        Returns:
+            tuple: (bytes, число нулевых битов дополнения в последнем байте)
+        """
+        encoded = bytearray()
+        accumulator = 0
+        bit_count = 0
 
-        # 4. Кодирование текста
-        encoded_text = ""
         for char in text:
-            encoded_text += self.codes[char]
+            code, length = code_table[char]
+            accumulator = (accumulator << length) | code
+            bit_count += length
 
-        return encoded_text, self.codes, len(text)
+            # Сбрасываем целые байты, когда накоплено не меньше 64 бит
+            if bit_count >= 64:
+                byte_count = bit_count >> 3
+                bit_count &= 7
+                encoded += (accumulator >> bit_count).to_bytes(byte_count, 'big')
+                accumulator &= (1 << bit_count) - 1
 
-    def decompress(self, encoded_text, codes, original_length):
+        padding = (8 - bit_count) % 8
+        if bit_count:
+            encoded += (accumulator << padding).to_bytes((bit_count + padding) >> 3, 'big')
+
+        return bytes(encoded), padding
+
+    @staticmethod
+    def _pack_bits_vectorised(text, code_table):
         """
+        Кодирование массивами NumPy: символы отображаются в коды и длины через таблицы,
+        битовые позиции - накопленная сумма длин, каждый код сдвигается в 32-битное окно своего первого байта.
+        Коды не пересекаются по битам, поэтому окна одного байта суммируются bincount с весами
+
         Args:
-            encoded_text (str): Сжатая битовая строка
-            codes (dict): Таблица кодов Хаффмана
+            text (str | bytes | bytearray | memoryview): Исходные данные
+            code_table (dict): Символ -> (значение кода, длина), длины не больше VECTOR_MAX_CODE_LENGTH
+
+        Returns:
+            tuple: (bytes, число нулевых битов дополнения в последнем байте) - как у _pack_bits
+        """
+        size = max(map(Serialization.symbol_to_int, code_table)) + 1
+        code_lookup = numpy.zeros(size, dtype=numpy.uint32)
+        length_lookup = numpy.zeros(size, dtype=numpy.uint32)
+        for symbol, (code, length) in code_table.items():
+            index = Serialization.symbol_to_int(symbol)
+            code_lookup[index] = code
+            length_lookup[index] = length
+
+        encoded = bytearray()
+        # Незаполненный последний байт предыдущей порции (биты выровнены по старшему краю)
+        carry = 0
+        carry_bits = 0
+        for start in range(0, len(text), VECTOR_CHUNK):
+            symbols, _ = Statistics.symbol_array(text[start:start + VECTOR_CHUNK])
+            lengths = length_lookup[symbols]
+            ends = numpy.cumsum(lengths, dtype=numpy.uint32) + numpy.uint32(carry_bits)
+            starts = ends - lengths
+            total_bits = int(ends[-1])
+
+            # Окна кодов, начинающихся в одном байте, не пересекаются: их сумма равна объединению
+            window = code_lookup[symbols] << (numpy.uint32(32) - (starts & numpy.uint32(7)) - lengths)
+            byte_count = ((total_bits + 7) >> 3) + 3
+            windows = numpy.bincount(starts >> 3, weights=window, minlength=byte_count).astype(numpy.uint32)
+
+            # Байт j собирается из окон, начинающихся в байтах j, j-1, j-2, j-3
+            chunk = windows >> numpy.uint32(24)
+            for k in range(1, 4):
+                chunk[k:] |= (windows[:-k] >> numpy.uint32(24 - 8 * k)) & numpy.uint32(0xFF)
+            chunk[0] |= carry
+            chunk = chunk.astype(numpy.uint8)
+
+            full_bytes = total_bits >> 3
+            encoded += chunk[:full_bytes].tobytes()
+            carry_bits = total_bits & 7
+            carry = int(chunk[full_bytes]) if carry_bits else 0
+
+        padding = (8 - carry_bits) % 8
+        if carry_bits:
+            encoded.append(carry)
+
+        return bytes(encoded), padding
+
+    @staticmethod
+    def _sync_points(text, code_lengths, interval):
+        """
+        Returns:
+            list: Пары (смещение в битах, номер символа) через каждые interval символов
+        """
+        if numpy is not None and len(text) >= VECTOR_MIN:
+            size = max(map(Serialization.symbol_to_int, code_lengths)) + 1
+            length_lookup = numpy.zeros(size, dtype=numpy.int64)
+            for symbol, length in code_lengths.items():
+                length_lookup[Serialization.symbol_to_int(symbol)] = length
+            segment_bits = lambda segment: int(length_lookup[Statistics.symbol_array(segment)[0]].sum())
+        else:
+            segment_bits = lambda segment: sum(map(code_lengths.__getitem__, segment))
+
+        sync_points = []
+        bit_offset = 0
+        for start in range(interval, len(text), interval):
+            bit_offset += segment_bits(text[start - interval:start])
+            sync_points.append((bit_offset, start))
+        return sync_points
+
+    def decompress(self, encoded_bytes, padding, code_lengths, original_length, sync_points=(), is_text=True):
+        """
+        Args:
+            encoded_bytes (bytes): Упакованные биты
+            padding (int): Число битов дополнения в последнем байте
+            code_lengths (dict): Длины канонических кодов Хаффмана
             original_length (int): Длина исходного текста
+            sync_points (list): Точки синхронизации (при полной распаковке не нужны)
+            is_text (bool): Исходные данные были строкой
 
         Returns:
-            str: Восстановленный текст
+            str | bytes: Восстановленный текст или байты
         """
         if original_length == 0:
-            return ""
+            return "" if is_text else b""
+
+        return self.segment_decoder(code_lengths)(encoded_bytes, 0, original_length)
+
+    def decompress_range(self, compressed_data, start, stop):
+        """
+        Распаковка символов [start, stop) начиная с ближайшей предшествующей точки синхронизации
+
+        Args:
+            compressed_data (tuple): Результат compress()
+            start (int): Номер первого символа
+            stop (int): Номер символа после последнего
+
+        Returns:
+            str | bytes: Символы отрезка
+        """
+        encoded_bytes, _, code_lengths, original_length, sync_points, is_text = compressed_data
+        stop = min(stop, original_length)
+        if start >= stop:
+            return "" if is_text else b""
+
+        bit_offset, symbol_offset = 0, 0
+        index = bisect_right(sync_points, start, key=lambda point: point[1])
+        if index:
+            bit_offset, symbol_offset = sync_points[index - 1]
 
-        self.reverse_codes = {code: char for char, code in codes.items()}
+        decoded = self.segment_decoder(code_lengths)(encoded_bytes, bit_offset, stop - symbol_offset)
+        return decoded[start - symbol_offset:]
 
-        if len(codes) == 1:
-            char = list(codes.keys())[0]
-            return char * original_length
+    @staticmethod
+    def segments(compressed_data):
+        """
+        Returns:
+            list: Независимо декодируемые отрезки (смещение в битах, номер первого символа, число символов)
+        """
+        _, _, _, original_length, sync_points, _ = compressed_data
+        bounds = [(0, 0)] + list(sync_points)
+        segments = []
+        for i, (bit_offset, symbol_offset) in enumerate(bounds):
+            end = bounds[i + 1][1] if i + 1 < len(bounds) else original_length
+            if end > symbol_offset:
+                segments.append((bit_offset, symbol_offset, end - symbol_offset))
+        return segments
+
+    def segment_decoder(self, code_lengths):
+        """
+        Таблицы декодирования строятся один раз для всех отрезков
 
-        # Декодирование
-        decoded_text = ""
-        current_code = ""
+        Returns:
+            callable: (упакованные биты, смещение в битах, число символов) -> str | bytes
+        """
+        is_text = Serialization.is_text_symbols(code_lengths)
+        if len(code_lengths) == 1:
+            char = next(iter(code_lengths))
+            return lambda encoded_bytes, bit_offset, count: char * count if is_text else bytes([char]) * count
 
-        for bit in encoded_text:
-            current_code += bit
-            if current_code in self.reverse_codes:
-                decoded_text += self.reverse_codes[current_code]
-                current_code = ""
+        decode_table = self._build_decode_table(code_lengths, self.table_bits)
 
-                if len(decoded_text) == original_length:
-                    break
+        def decode(encoded_bytes, bit_offset, count):
+            decoded = self._decode_symbols(encoded_bytes, bit_offset, count, decode_table)
+            return ''.join(decoded) if is_text else bytes(decoded)
 
-        return decoded_text
+        return decode
+
+    @staticmethod
+    def _decode_symbols(encoded_bytes, bit_offset, count, decode_table):
+        """
+        Args:
+            encoded_bytes (bytes | memoryview): Упакованные биты
+            bit_offset (int): Смещение в битах начала первого кода
+            count (int): Число декодируемых символов
+            decode_table (tuple): Результат _build_decode_table
+
+        Returns:
+            list: Символы
+        """
+        # Декодирование по таблицам: один просмотр таблицы на символ
+        table_bits, max_length, table = decode_table
+        table_mask = (1 << table_bits) - 1
+
+        decoded = [None] * count
+        pos = bit_offset >> 3
+        # Биты первого байта до смещения уже принадлежат предыдущему отрезку
+        bit_count = 8 - (bit_offset & 7) if count else 0
+        accumulator = encoded_bytes[pos] & ((1 << bit_count) - 1) if bit_count else 0
+        pos += 1
+
+        for i in range(count):
+            # Подкачиваем по 8 байт, пока в аккумуляторе меньше битов, чем длина самого длинного кода
+            while bit_count < max_length:
+                chunk = encoded_bytes[pos:pos + 8]
+                accumulator = (accumulator << 64) | (int.from_bytes(chunk, 'big') << (8 * (8 - len(chunk))))
+                bit_count += 64
+                pos += 8
+
+            char, length, subtable = table[(accumulator >> (bit_count - table_bits)) & table_mask]
+            if subtable is not None:
+                sub_bits, sub_entries = subtable
+                index = (accumulator >> (bit_count - table_bits - sub_bits)) & ((1 << sub_bits) - 1)
+                char, length = sub_entries[index]
+
+            bit_count -= length
+            accumulator &= (1 << bit_count) - 1
+            decoded[i] = char
+
+        return decoded
+
+    @staticmethod
+    def _build_decode_table(code_lengths, table_bits):
+        """
+        Построение таблиц декодирования по длинам канонических кодов (без дерева):
+        первичная на table_bits битов и вторичные для длинных кодов
+
+        Args:
+            code_lengths (dict): Длины кодов
+            table_bits (int): Разрядность первичной таблицы
+
+        Returns:
+            tuple: (разрядность первичной таблицы, максимальная длина кода, таблица)
+                Элемент таблицы - (символ, длина кода, None) или (None, 0, (разрядность, вторичная таблица))
+        """
+        max_length = max(code_lengths.values())
+        table_bits = min(table_bits, max_length)
+        table = [(None, 0, None)] * (1 << table_bits)
+
+        long_codes = {}
+        for char, (value, length) in HuffmanCoding.canonical_codes(code_lengths).items():
+            if length <= table_bits:
+                # Код занимает все ячейки, начинающиеся с него
+                start = value << (table_bits - length)
+                entry = (char, length, None)
+                for index in range(start, start + (1 << (table_bits - length))):
+                    table[index] = entry
+            else:
+                prefix = value >> (length - table_bits)
+                long_codes.setdefault(prefix, []).append((char, length, value))
+
+        for prefix, entries in long_codes.items():
+            sub_bits = max(length for _, length, _ in entries) - table_bits
+            sub_entries = [(None, 0)] * (1 << sub_bits)
+            for char, length, value in entries:
+                extra = length - table_bits
+                start = (value & ((1 << extra) - 1)) << (sub_bits - extra)
+                for index in range(start, start + (1 << (sub_bits - extra))):
+                    sub_entries[index] = (char, length)
+            table[prefix] = (None, 0, (sub_bits, sub_entries))
+
+        return table_bits, max_length, table
 
     def _build_huffman_tree(self, frequencies):
         """Построение дерева Хаффмана"""
@@ -177,23 +516,20 @@ class HuffmanCoding(Super.CompressionAlgorithm):
 
         return result
 
-    def save_to_file(self, encoded_text, codes, original_length, filename):
+    def save_to_file(self, encoded_bytes, padding, code_lengths, original_length, sync_points, is_text, filename):
         """
         Args:
-            encoded_text (str): Закодированный текст (битовая строка)
-            codes (dict): Словарь кодов Хаффмана
+            encoded_bytes (bytes): Упакованные биты
+            padding (int): Число битов дополнения в последнем байте
+            code_lengths (dict): Длины канонических кодов
             original_length (int): Длина исходного текста
+            sync_points (list): Точки синхронизации
+            is_text (bool): Исходные данные были строкой
             filename (str): Имя файла для сохранения
         """
-        data = {
-            'encoded_text': encoded_text,
-            'codes': codes,
-            'original_length': original_length
-        }
-
-        # Сохраняем данные в файл
-        with open(filename, 'wb') as file:
-            pickle.dump(data, file)
+        # Контейнер содержит только длины кодов - сами коды канонические
+        self.save_compressed((encoded_bytes, padding, code_lengths, original_length, sync_points, is_text),
+                             original_length, filename, is_text)
 
         # Рассчитываем степень сжатия
         if os.path.exists(filename):
@@ -207,16 +543,9 @@ class HuffmanCoding(Super.CompressionAlgorithm):
             filename (str): Имя файла для чтения
 
         Returns:
-            tuple: (закодированный текст, коды, исходная длина)
+            tuple: (упакованные биты, дополнение, длины кодов, исходная длина, точки синхронизации, признак текста)
         """
-        with open(filename, 'rb') as file:
-            data = pickle.load(file)
-
-        encoded_text = data['encoded_text']
-        codes = data['codes']
-        original_length = data['original_length']
-
-        return encoded_text, codes, original_length
+        return self.load_compressed(filename)
 
     def compress_to_file(self, text, filename):
         """
@@ -226,9 +555,9 @@ class HuffmanCoding(Super.CompressionAlgorithm):
             text (str): Исходный текст для сжатия
             filename (str): Имя файла для сохранения
         """
-        encoded_text, codes, original_length = self.compress(text)
-        self.save_to_file(encoded_text, codes, original_length, filename)
-        return encoded_text, codes, original_length
+        compressed_data = self.compress(text)
+        self.save_to_file(*compressed_data, filename)
+        return compressed_data
 
     def decompress_from_file(self, filename):
         """
@@ -240,13 +569,60 @@ class HuffmanCoding(Super.CompressionAlgorithm):
         Returns:
             str: Декодированный текст
         """
-        encoded_text, codes, original_length = self.load_from_file(filename)
-        return self.decompress(encoded_text, codes, original_length)
+        return self.decompress(*self.load_from_file(filename))
+
+    def decompress_data(self, compressed_data):
+        return self.decompress(*compressed_data)
+
+    def to_bytes(self, compressed_data):
+        """
+        Длина, дополнение, признак текста, длины кодов (символ, длина),
+        точки синхронизации (разности смещений как varint) и упакованные биты
+        """
+        encoded_bytes, padding, code_lengths, original_length, sync_points, is_text = compressed_data
+        buffer = bytearray()
+        Serialization.write_varint(buffer, original_length)
+        buffer.append(padding)
+        buffer.append(is_text)
+        Serialization.write_varint(buffer, len(code_lengths))
+        for char in sorted(code_lengths):
+            Serialization.write_varint(buffer, Serialization.symbol_to_int(char))
+            buffer.append(code_lengths[char])
+        Serialization.write_varint(buffer, len(sync_points))
+        previous_bits, previous_symbol = 0, 0
+        for bit_offset, symbol_offset in sync_points:
+            Serialization.write_varint(buffer, bit_offset - previous_bits)
+            Serialization.write_varint(buffer, symbol_offset - previous_symbol)
+            previous_bits, previous_symbol = bit_offset, symbol_offset
+        buffer += encoded_bytes
+        return bytes(buffer)
+
+    def from_bytes(self, data):
+        original_length, pos = Serialization.read_varint(data, 0)
+        padding = data[pos]
+        is_text = bool(data[pos + 1])
+        symbol_count, pos = Serialization.read_varint(data, pos + 2)
+        code_lengths = {}
+        for _ in range(symbol_count):
+            code_point, pos = Serialization.read_varint(data, pos)
+            code_lengths[Serialization.int_to_symbol(code_point, is_text)] = data[pos]
+            pos += 1
+
+        sync_count, pos = Serialization.read_varint(data, pos)
+        sync_points = []
+        bit_offset, symbol_offset = 0, 0
+        for _ in range(sync_count):
+            bit_delta, pos = Serialization.read_varint(data, pos)
+            symbol_delta, pos = Serialization.read_varint(data, pos)
+            bit_offset += bit_delta
+            symbol_offset += symbol_delta
+            sync_points.append((bit_offset, symbol_offset))
+        return data[pos:], padding, code_lengths, original_length, sync_points, is_text
 
     @staticmethod
     def get_encoded_size(compressed_data):
-        encoded_text, codes, text = compressed_data
-        return len(encoded_text)
+        """Размер в битах: длины кодов и упакованные данные в том виде, как они попадают в контейнер"""
+        return len(HuffmanCoding().to_bytes(compressed_data)) * 8
 
 if __name__ == "__main__":
     huffman = HuffmanCoding()
@@ -257,9 +633,6 @@ if __name__ == "__main__":
     with open('Original_text.bin', 'w+') as f:
         f.write(' '.join(format(ord(i), '08b') for i in text))
 
-    with open('Huffman_compressed.txt', 'w+') as f:
-        f.write(str(huffman.compress(text)))
-
     huffman.compress_to_file(text, "Huffman_compressed.bin")
 
     decoded_text = huffman.decompress_from_file("Huffman_compressed.bin")
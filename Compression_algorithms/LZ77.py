@@ -1,108 +1,293 @@
+from array import array
+
 from Compression_algorithms import Super
+from Compression_algorithms import Match_finder
+from Compression_algorithms import Serialization
+from Compression_algorithms.Huffman2 import HuffmanCoding
+
+
+# Флаги заголовка упакованного потока
+FLAG_TEXT = 1
+FLAG_HUFFMAN = 2
+
+# Уровни сжатия: число шагов ленивого поиска для уровней 1-3, уровень 4 - оптимальный разбор
+LEVEL_GREEDY = 1
+LEVEL_OPTIMAL = 4
+LAZY_STEPS = {1: 0, 2: 1, 3: 2}
+
+# Модель стоимости оптимального разбора (в битах)
+LITERAL_COST = 8
+# Число литералов перед совпадением (обычно один байт varint)
+SEQUENCE_COST = 8
+# Совпадения не короче NICE_LENGTH принимаются целиком без перебора длин
+NICE_LENGTH = 64
+
+
+def _varint_bits(value):
+    return 8 * max(1, (value.bit_length() + 6) // 7)
+
 
 class LZ77(Super.CompressionAlgorithm):
-    def __init__(self, window_size=100000, lookahead_size=100000):
-        super().__init__("LZ77")
+    """
+    Упакованный поток токенов: последовательности (длина серии литералов, литералы, длина совпадения, смещение).
+
+    Формат: флаги | varint длина результата | поток литералов | поток команд. Команды - varint: число литералов,
+    затем длина совпадения - MIN_MATCH + 1 (0 - конец потока) и смещение.
+    Строка сжимается как UTF-8, смещения и длины считаются в байтах
+    """
+    container_id = 2
+
+    def __init__(self, window_size=100000, lookahead_size=100000, match_finder='hash_chain', chain_depth=32,
+                 huffman=False, level=LEVEL_GREEDY):
+        name = "LZ77" if level == LEVEL_GREEDY else f"LZ77 (level {level})"
+        super().__init__(name + " + Huffman" if huffman else name)
         """
         Args:
             window_size (int): Размер окна поиска
             lookahead_size (int): Размер буфера просмотра вперед
+            match_finder (str | type): Поисковик совпадений ('hash_chain', 'suffix_array' или подкласс MatchFinder)
+            chain_depth (int): Глубина просмотра кандидатов в поисковике
+            huffman (bool): Дополнительно сжимать потоки литералов и команд кодом Хаффмана (как в DEFLATE)
+            level (int): Уровень сжатия - стратегия разбора: 1 - жадный, 2 - ленивый на 1 символ,
+                3 - ленивый на 2 символа, 4 - оптимальный по модели стоимости
         """
+        if level not in LAZY_STEPS and level != LEVEL_OPTIMAL:
+            raise ValueError(f"Неизвестный уровень сжатия: {level}")
         self.window_size = window_size
         self.lookahead_size = lookahead_size
+        self.match_finder = match_finder
+        self.chain_depth = chain_depth
+        self.huffman = huffman
+        self.level = level
 
     def compress(self, text):
         """
         Args:
-            text (str): Входная строка для сжатия
+            text (str | bytes | bytearray | memoryview): Входная строка или байты для сжатия
         Returns:
-            list: Список троек (offset, length, next_char)
+            bytes: Упакованный поток токенов
         """
-        if not text:
-            return []
+        is_text = isinstance(text, str)
+        data = text.encode('utf-8') if is_text else text
+        literals, commands = self._parse(data)
 
-        compressed = []
-        i = 0
+        buffer = bytearray()
+        buffer.append((FLAG_TEXT if is_text else 0) | (FLAG_HUFFMAN if self.huffman else 0))
+        Serialization.write_varint(buffer, len(data))
+        if self.huffman:
+            huffman = HuffmanCoding()
+            Serialization.write_bytes(buffer, huffman.to_bytes(huffman.compress(bytes(literals))))
+            buffer += huffman.to_bytes(huffman.compress(bytes(commands)))
+        else:
+            Serialization.write_bytes(buffer, literals)
+            buffer += commands
+        return bytes(buffer)
 
-        while i < len(text):
-            search_start = max(0, i - self.window_size)
-            search_buffer = text[search_start:i]
-            lookahead_buffer = text[i:i + self.lookahead_size]
+    def _parse(self, data):
+        """
+        Разбор на литералы и совпадения стратегией, заданной уровнем сжатия
 
-            best_match = self._find_longest_match(search_buffer, lookahead_buffer)
+        Returns:
+            tuple: (bytearray литералов, bytearray команд)
+        """
+        literals = bytearray()
+        commands = bytearray()
+        n = len(data)
 
-            if best_match[1] > 0:
-                offset, length = best_match
-                next_char = text[i + length] if i + length < len(text) else ''
-                compressed.append((offset, length, next_char))
-                i += length + 1
+        literal_start = 0
+        if n:
+            finder = Match_finder.create_match_finder(self.match_finder, self.window_size,
+                                                      self.lookahead_size, self.chain_depth)
+            finder.reset(data)
+            if self.level == LEVEL_OPTIMAL:
+                matches = self._parse_optimal(finder, n)
             else:
-                compressed.append((0, 0, text[i]))
+                matches = self._parse_lazy(finder, n, LAZY_STEPS[self.level])
+
+            for pos, offset, length in matches:
+                self._write_sequence(literals, commands, data[literal_start:pos])
+                Serialization.write_varint(commands, length - Match_finder.MIN_MATCH + 1)
+                Serialization.write_varint(commands, offset)
+                literal_start = pos + length
+
+        self._write_sequence(literals, commands, data[literal_start:n])
+        commands.append(0)
+        return literals, commands
+
+    @staticmethod
+    def _parse_lazy(finder, n, lazy_steps):
+        """
+        Жадный (lazy_steps = 0) или ленивый разбор: совпадение откладывается, если через
+        1..lazy_steps литералов начинается более длинное
+
+        Yields:
+            tuple: (позиция, смещение, длина) совпадений по порядку
+        """
+        inserted = 0
+        i = 0
+        pending = None
+        while i < n:
+            # Все пройденные позиции становятся кандидатами для следующих совпадений
+            while inserted < i:
+                finder.insert(inserted)
+                inserted += 1
+
+            offset, length = pending or finder.find(i)
+            pending = None
+            if length == 0:
                 i += 1
+                continue
+
+            deferred = 0
+            for step in range(1, lazy_steps + 1):
+                if i + step >= n:
+                    break
+                while inserted < i + step:
+                    finder.insert(inserted)
+                    inserted += 1
+                next_offset, next_length = finder.find(i + step)
+                # Каждый отложенный литерал должен окупиться удлинением совпадения
+                if next_length > length + step - 1:
+                    deferred = step
+                    pending = (next_offset, next_length)
+                    break
+
+            if deferred:
+                i += deferred
+                continue
 
-        return compressed
+            yield i, offset, length
+            i += length
 
     @staticmethod
-    def _find_longest_match(search_buffer, lookahead_buffer):
+    def _parse_optimal(finder, n):
         """
-        Args:
-            search_buffer (str): Буфер поиска
-            lookahead_buffer (str): Буфер просмотра вперед
+        Оптимальный разбор по модели стоимости в битах: кратчайший путь по позициям буфера,
+        где переходы - литерал или совпадение любой длины от MIN_MATCH до найденной
 
         Returns:
-            tuple: (offset, length) - смещение и длина совпадения
+            iterator: Кортежи (позиция, смещение, длина) совпадений по порядку
         """
-        if not search_buffer or not lookahead_buffer:
-            return (0, 0)
-        best_offset = 0
-        best_length = 0
+        min_match = Match_finder.MIN_MATCH
+        infinity = float('inf')
+        cost = [infinity] * (n + 1)
+        cost[0] = 0
+        # Переход, которым достигнута позиция: длина 0 - литерал
+        step_length = array('I', [0]) * (n + 1)
+        step_offset = array('I', [0]) * (n + 1)
 
-        for i in range(len(search_buffer)):
-            current_length = 0
+        i = 0
+        inserted = 0
+        while i < n:
+            while inserted < i:
+                finder.insert(inserted)
+                inserted += 1
 
-            while (current_length < len(lookahead_buffer) and
-                   current_length < len(search_buffer) - i and
-                   search_buffer[i + current_length] == lookahead_buffer[current_length]):
-                current_length += 1
+            base = cost[i]
+            if base + LITERAL_COST < cost[i + 1]:
+                cost[i + 1] = base + LITERAL_COST
+                step_length[i + 1] = 0
 
-            if current_length > best_length:
-                best_length = current_length
-                best_offset = len(search_buffer) - i
+            offset, length = finder.find(i)
+            if length == 0:
+                i += 1
+                continue
 
-        return (best_offset, best_length)
+            offset_cost = _varint_bits(offset) + SEQUENCE_COST
+            if length >= NICE_LENGTH:
+                # Длинное совпадение принимается без перебора: позиции внутри него не раскрываются
+                candidates = (length,)
+            else:
+                candidates = range(min_match, length + 1)
 
-    """@staticmethod
-    def get_encoded_size(compressed):
-        BITS_OFFSET = 8
-        BITS_LENGTH = 8
-        BITS_CHAR = 8
+            for candidate in candidates:
+                total = base + offset_cost + _varint_bits(candidate - min_match + 1)
+                if total < cost[i + candidate]:
+                    cost[i + candidate] = total
+                    step_length[i + candidate] = candidate
+                    step_offset[i + candidate] = offset
 
-        bits_per_triplet = BITS_OFFSET + BITS_LENGTH + BITS_CHAR
-        total_bits = len(compressed) * bits_per_triplet
-        return total_bits"""
+            i += length if length >= NICE_LENGTH else 1
+
+        # Обратный проход от конца буфера восстанавливает выбранные совпадения
+        matches = []
+        pos = n
+        while pos > 0:
+            length = step_length[pos]
+            if length:
+                pos -= length
+                matches.append((pos, step_offset[pos + length], length))
+            else:
+                pos -= 1
+
+        return reversed(matches)
+
+    @staticmethod
+    def _write_sequence(literals, commands, run):
+        Serialization.write_varint(commands, len(run))
+        literals += run
+
+    @staticmethod
+    def get_encoded_size(compressed_data):
+        """Размер в битах упакованного потока"""
+        return len(compressed_data) * 8
+
+    def to_bytes(self, compressed_data):
+        return bytes(compressed_data)
+
+    def from_bytes(self, data):
+        return bytes(data)
 
     @staticmethod
     def decompress(compressed_data):
         """
         Args:
-            compressed_data (list): Список троек (offset, length, next_char)
+            compressed_data (bytes): Упакованный поток токенов
 
         Returns:
-            str: Восстановленная строка
+            str | bytes: Восстановленная строка или байты
         """
         if not compressed_data:
             return ""
 
-        result = []
+        flags = compressed_data[0]
+        size, pos = Serialization.read_varint(compressed_data, 1)
+        literals, pos = Serialization.read_bytes(compressed_data, pos)
+        commands = compressed_data[pos:]
+        if flags & FLAG_HUFFMAN:
+            huffman = HuffmanCoding()
+            literals = huffman.decompress(*huffman.from_bytes(literals))
+            commands = huffman.decompress(*huffman.from_bytes(commands))
+
+        # Результат заранее выделен целиком, символы переносятся только срезами
+        result = bytearray(size)
+        out = 0
+        literal_pos = 0
+        pos = 0
+        while True:
+            literal_count, pos = Serialization.read_varint(commands, pos)
+            result[out:out + literal_count] = literals[literal_pos:literal_pos + literal_count]
+            out += literal_count
+            literal_pos += literal_count
 
-        for offset, length, next_char in compressed_data:
-            if offset > 0 and length > 0:
-                start_pos = len(result) - offset
-                for i in range(length):
-                    result.append(result[start_pos + i])
+            match_code, pos = Serialization.read_varint(commands, pos)
+            if match_code == 0:
+                break
+            offset, pos = Serialization.read_varint(commands, pos)
+            length = match_code + Match_finder.MIN_MATCH - 1
+            if offset == 0 or offset > out or out + length > size:
+                raise ValueError("Некорректное совпадение в потоке LZ77")
 
-            if next_char:
-                result.append(next_char)
+            # Перекрывающееся совпадение (offset < length) повторяет период offset:
+            # каждая копия удваивает уже записанный отрезок, так что срезов O(log(length / offset))
+            start_pos = out - offset
+            while length > 0:
+                chunk = min(out - start_pos, length)
+                result[out:out + chunk] = result[start_pos:start_pos + chunk]
+                out += chunk
+                length -= chunk
 
-        return ''.join(result)
+        if out != size:
+            raise ValueError("Длина распакованных данных LZ77 не совпадает с заголовком")
 
+        return result.decode('utf-8') if flags & FLAG_TEXT else bytes(result)
@@ -0,0 +1,204 @@
+from array import array
+
+from Compression_algorithms import Suffix_array
+
+
+MIN_MATCH = 3
+
+
+class MatchFinder:
+    """Базовый класс поиска совпадений для LZ77 (работает по индексам исходного буфера)"""
+
+    def __init__(self, window_size, max_length):
+        """
+        Args:
+            window_size (int): Размер окна поиска
+            max_length (int): Максимальная длина совпадения
+        """
+        self.window_size = window_size
+        self.max_length = max_length
+        self.data = None
+        self.size = 0
+
+    def reset(self, data):
+        """Подготовка к поиску по новому буферу"""
+        self.data = data
+        self.size = len(data)
+
+    def insert(self, pos):
+        """Регистрация позиции pos как возможного начала будущих совпадений"""
+
+    def find(self, pos):
+        """
+        Args:
+            pos (int): Текущая позиция в буфере
+
+        Returns:
+            tuple: (offset, length) - смещение и длина совпадения
+        """
+        raise NotImplementedError
+
+
+class HashChainMatchFinder(MatchFinder):
+    """Поиск по цепочкам хешей трехсимвольных префиксов"""
+
+    def __init__(self, window_size, max_length, chain_depth=32, hash_bits=16):
+        """
+        Args:
+            chain_depth (int): Максимальное число просматриваемых кандидатов
+            hash_bits (int): Размер хеш-таблицы в битах
+        """
+        super().__init__(window_size, max_length)
+        self.chain_depth = chain_depth
+        self.hash_bits = hash_bits
+        self.hash_mask = (1 << hash_bits) - 1
+        self.head = None
+        self.prev = None
+        self.prev_size = 0
+
+    def reset(self, data):
+        super().reset(data)
+        self.head = array('q', [-1]) * (1 << self.hash_bits)
+        # prev - кольцевой буфер размером с окно: prev[pos % size] = предыдущая позиция с тем же хешем
+        self.prev_size = max(1, min(self.window_size, self.size))
+        self.prev = array('q', [-1]) * self.prev_size
+
+    def _hash(self, pos):
+        data = self.data
+        value = (((data[pos] << 8) ^ data[pos + 1]) << 8) ^ data[pos + 2]
+        return ((value * 2654435761) & 0xFFFFFFFF) >> (32 - self.hash_bits) & self.hash_mask
+
+    def insert(self, pos):
+        if pos + MIN_MATCH > self.size:
+            return
+        h = self._hash(pos)
+        self.prev[pos % self.prev_size] = self.head[h]
+        self.head[h] = pos
+
+    def find(self, pos):
+        data = self.data
+        limit = min(self.max_length, self.size - pos)
+        if limit < MIN_MATCH:
+            return (0, 0)
+
+        prev = self.prev
+        prev_size = self.prev_size
+        min_pos = pos - self.window_size
+        candidate = self.head[self._hash(pos)]
+        depth = self.chain_depth
+
+        best_offset = 0
+        best_length = 0
+
+        while candidate >= 0 and candidate >= min_pos and depth > 0:
+            # Быстрая проверка: кандидат может улучшить результат, только если совпадает символ best_length
+            if data[candidate + best_length] == data[pos + best_length]:
+                length = 0
+                while length < limit and data[candidate + length] == data[pos + length]:
+                    length += 1
+
+                if length > best_length:
+                    best_length = length
+                    best_offset = pos - candidate
+                    if length == limit:
+                        break
+
+            candidate = prev[candidate % prev_size]
+            depth -= 1
+
+        if best_length < MIN_MATCH:
+            return (0, 0)
+        return (best_offset, best_length)
+
+
+class SuffixArrayMatchFinder(MatchFinder):
+    """Поиск по суффиксному массиву и массиву LCP всего буфера"""
+
+    def __init__(self, window_size, max_length, chain_depth=32):
+        """
+        Args:
+            chain_depth (int): Максимальное число соседей в суффиксном массиве в каждую сторону
+        """
+        super().__init__(window_size, max_length)
+        self.chain_depth = chain_depth
+        self.sa = None
+        self.rank = None
+        self.lcp = None
+
+    def reset(self, data):
+        super().reset(data)
+        self.sa = Suffix_array.build_suffix_array(data)
+        self.lcp = Suffix_array.build_lcp_array(data, self.sa)
+        self.rank = array('q', [0]) * self.size
+        for i, suffix in enumerate(self.sa):
+            self.rank[suffix] = i
+
+    def find(self, pos):
+        limit = min(self.max_length, self.size - pos)
+        if limit < MIN_MATCH:
+            return (0, 0)
+
+        sa = self.sa
+        lcp = self.lcp
+        min_pos = pos - self.window_size
+        r = self.rank[pos]
+
+        best_offset = 0
+        best_length = 0
+
+        # Соседи выше по суффиксному массиву: общий префикс - минимум lcp на отрезке
+        common = limit
+        j = r
+        depth = self.chain_depth
+        while j > 0 and depth > 0:
+            common = min(common, lcp[j])
+            if common < MIN_MATCH or common < best_length:
+                break
+            candidate = sa[j - 1]
+            if min_pos <= candidate < pos:
+                if common > best_length or (common == best_length and pos - candidate < best_offset):
+                    best_length = common
+                    best_offset = pos - candidate
+            depth -= 1
+            j -= 1
+
+        # Соседи ниже по суффиксному массиву
+        common = limit
+        j = r + 1
+        depth = self.chain_depth
+        while j < self.size and depth > 0:
+            common = min(common, lcp[j])
+            if common < MIN_MATCH or common < best_length:
+                break
+            candidate = sa[j]
+            if min_pos <= candidate < pos:
+                if common > best_length or (common == best_length and pos - candidate < best_offset):
+                    best_length = common
+                    best_offset = pos - candidate
+            depth -= 1
+            j += 1
+
+        if best_length < MIN_MATCH:
+            return (0, 0)
+        return (best_offset, best_length)
+
+
+MATCH_FINDERS = {
+    'hash_chain': HashChainMatchFinder,
+    'suffix_array': SuffixArrayMatchFinder,
+}
+
+
+def create_match_finder(match_finder, window_size, max_length, chain_depth):
+    """
+    Args:
+        match_finder (str | type): Имя из MATCH_FINDERS или подкласс MatchFinder
+
+    Returns:
+        MatchFinder: Экземпляр поисковика совпадений
+    """
+    if isinstance(match_finder, str):
+        if match_finder not in MATCH_FINDERS:
+            raise ValueError(f"Неизвестный поисковик совпадений: {match_finder}")
+        match_finder = MATCH_FINDERS[match_finder]
+    return match_finder(window_size, max_length, chain_depth=chain_depth)
@@ -0,0 +1,192 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from Compression_algorithms import Container
+from Compression_algorithms.Archive import Archive
+
+
+# Состояние процесса-исполнителя: общая память, алгоритм или архив, признак текста
+_worker = {}
+
+
+def _attach(name, size):
+    """Подключение к общей памяти родителя; сегмент удаляет только родитель"""
+    shm = shared_memory.SharedMemory(name=name)
+    _worker['shm'] = shm
+    return shm.buf[:size]
+
+
+def _init_compress(name, size, algorithm, is_text):
+    _worker['data'] = _attach(name, size)
+    _worker['algorithm'] = algorithm
+    _worker['is_text'] = is_text
+
+
+def _compress_block(span):
+    """
+    Args:
+        span (tuple): (начало, конец) блока в общей памяти
+
+    Returns:
+        bytes: Сериализованный результат compress() блока
+    """
+    start, end = span
+    block = _worker['data'][start:end]
+    if _worker['is_text']:
+        block = str(block, 'utf-8')
+    algorithm = _worker['algorithm']
+    return algorithm.to_bytes(algorithm.compress(block))
+
+
+def _init_decompress(name, size):
+    _worker['archive'] = Archive(_attach(name, size))
+
+
+def _decompress_block(number):
+    return _worker['archive'].read_block(number)
+
+
+def _init_huffman(name, size, algorithm, code_lengths):
+    _worker['data'] = _attach(name, size)
+    _worker['decode'] = algorithm.segment_decoder(code_lengths)
+
+
+def _decode_huffman_segment(segment):
+    """
+    Args:
+        segment (tuple): (смещение в битах, номер первого символа, число символов)
+    """
+    bit_offset, _, count = segment
+    return _worker['decode'](_worker['data'], bit_offset, count)
+
+
+def _run(tasks, function, initializer, initargs, workers):
+    """Выполнение задач в пуле процессов; результаты возвращаются в порядке задач"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(function, tasks))
+
+
+def _to_shared_memory(chunks, size):
+    """
+    Args:
+        chunks (list): Байтовые фрагменты, записываемые в общую память подряд
+        size (int): Суммарная длина фрагментов
+
+    Returns:
+        SharedMemory: Сегмент с данными (не меньше одного байта)
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    pos = 0
+    for chunk in chunks:
+        shm.buf[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return shm
+
+
+def compress_parallel(algorithm, data, block_size=None, workers=None):
+    """
+    Сжатие независимых блоков в пуле процессов; блоки передаются через общую память,
+    а не копиями в аргументах задач. Результат совпадает с create_archive при том же размере блока
+
+    Args:
+        algorithm (CompressionAlgorithm): Алгоритм сжатия
+        data (str | bytes | bytearray | memoryview): Исходные данные
+        block_size (int): Размер блока (по умолчанию - stream_block_size алгоритма)
+        workers (int): Число процессов (по умолчанию - число ядер)
+
+    Returns:
+        bytes: Контейнер
+    """
+    block_size = block_size or algorithm.stream_block_size
+    workers = workers or os.cpu_count()
+    is_text = isinstance(data, str)
+
+    # Границы блоков считаются в символах исходных данных, в общей памяти строка хранится в UTF-8
+    raw_lengths = []
+    chunks = []
+    for start in range(0, len(data), block_size):
+        block = data[start:start + block_size]
+        raw_lengths.append(len(block))
+        chunks.append(block.encode('utf-8') if is_text else block)
+
+    spans = []
+    pos = 0
+    for chunk in chunks:
+        spans.append((pos, pos + len(chunk)))
+        pos += len(chunk)
+
+    if workers > 1 and len(spans) > 1:
+        shm = _to_shared_memory(chunks, pos)
+        try:
+            payloads = _run(spans, _compress_block, _init_compress, (shm.name, pos, algorithm, is_text), workers)
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        payloads = [algorithm.to_bytes(algorithm.compress(data[start:start + block_size]))
+                    for start in range(0, len(data), block_size)]
+
+    buffer = bytearray()
+    flags = Container.FLAG_TEXT if is_text else 0
+    Container.write_header(buffer, algorithm.container_id, flags, algorithm.get_params())
+    index = []
+    for raw_length, payload in zip(raw_lengths, payloads):
+        index.append((len(buffer), raw_length))
+        Container.write_block(buffer, raw_length, payload)
+    Container.write_end(buffer, index)
+    return bytes(buffer)
+
+
+def decompress_parallel(data, workers=None):
+    """
+    Распаковка блоков контейнера в пуле процессов; контейнер передается через общую память
+
+    Args:
+        data (bytes | bytearray | mmap): Контейнер
+        workers (int): Число процессов (по умолчанию - число ядер)
+
+    Returns:
+        str | bytes: Все данные контейнера
+    """
+    workers = workers or os.cpu_count()
+    archive = Archive(data)
+    if workers <= 1 or len(archive) <= 1:
+        return archive.read()
+
+    shm = _to_shared_memory([data], len(data))
+    try:
+        parts = _run(range(len(archive)), _decompress_block, _init_decompress, (shm.name, len(data)), workers)
+    finally:
+        shm.close()
+        shm.unlink()
+    return ''.join(parts) if archive.reader.is_text else b''.join(parts)
+
+
+def decompress_huffman_parallel(algorithm, compressed_data, workers=None):
+    """
+    Распаковка результата HuffmanCoding.compress по отрезкам между точками синхронизации;
+    упакованные биты передаются исполнителям через общую память
+
+    Args:
+        algorithm (HuffmanCoding): Кодек (sync_interval задается при сжатии)
+        compressed_data (tuple): Результат compress() с точками синхронизации
+        workers (int): Число процессов (по умолчанию - число ядер)
+
+    Returns:
+        str | bytes: Восстановленные данные
+    """
+    workers = workers or os.cpu_count()
+    encoded_bytes, _, code_lengths, _, _, is_text = compressed_data
+    segments = algorithm.segments(compressed_data)
+    if workers <= 1 or len(segments) <= 1:
+        return algorithm.decompress_data(compressed_data)
+
+    shm = _to_shared_memory([encoded_bytes], len(encoded_bytes))
+    try:
+        parts = _run(segments, _decode_huffman_segment, _init_huffman,
+                     (shm.name, len(encoded_bytes), algorithm, code_lengths), workers)
+    finally:
+        shm.close()
+        shm.unlink()
+    return ''.join(parts) if is_text else b''.join(parts)
@@ -0,0 +1,94 @@
+TOP = 1 << 24
+MASK32 = 0xFFFFFFFF
+
+# Максимальная сумма частот модели: после нормализации range >= 2^24, значит range // total >= 2^8
+MAX_TOTAL = 1 << 16
+
+
+class RangeEncoder:
+    """32-битный интервальный кодер с переносом (схема cache/cache_size как в LZMA)"""
+
+    def __init__(self):
+        self.low = 0
+        self.range = MASK32
+        self.cache = 0
+        self.cache_size = 1
+        self.output = bytearray()
+
+    def encode(self, start, freq, total):
+        """
+        Args:
+            start (int): Накопленная частота символов перед кодируемым
+            freq (int): Частота кодируемого символа
+            total (int): Сумма частот (не больше MAX_TOTAL)
+        """
+        r = self.range // total
+        self.low += start * r
+        self.range = r * freq
+        while self.range < TOP:
+            self.range <<= 8
+            self._shift_low()
+
+    def _shift_low(self):
+        # Байт из cache выводится, только когда перенос в него уже невозможен
+        if self.low < 0xFF000000 or self.low > MASK32:
+            carry = self.low >> 32
+            byte = self.cache
+            while True:
+                self.output.append((byte + carry) & 0xFF)
+                byte = 0xFF
+                self.cache_size -= 1
+                if self.cache_size == 0:
+                    break
+            self.cache = (self.low >> 24) & 0xFF
+        self.cache_size += 1
+        self.low = (self.low << 8) & MASK32
+
+    def finish(self):
+        """
+        Returns:
+            bytes: Закодированный поток (первый, всегда нулевой байт не выводится)
+        """
+        for _ in range(5):
+            self._shift_low()
+        return bytes(self.output[1:])
+
+
+class RangeDecoder:
+    """Декодер для потока RangeEncoder"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes): Результат RangeEncoder.finish()
+        """
+        self.data = data
+        self.pos = 0
+        self.range = MASK32
+        self.code = 0
+        for _ in range(4):
+            self.code = (self.code << 8) | self._next_byte()
+
+    def _next_byte(self):
+        pos = self.pos
+        self.pos = pos + 1
+        return self.data[pos] if pos < len(self.data) else 0
+
+    def get_freq(self, total):
+        """
+        Args:
+            total (int): Сумма частот модели
+
+        Returns:
+            int: Накопленная частота, попадающая в интервал декодируемого символа
+        """
+        self.range //= total
+        return min(self.code // self.range, total - 1)
+
+    def decode(self, start, freq):
+        """Исключение интервала найденного символа (вызывается после get_freq)"""
+        self.code -= start * self.range
+        self.range *= freq
+        while self.range < TOP:
+            self.code = ((self.code << 8) | self._next_byte()) & MASK32
+            self.range <<= 8
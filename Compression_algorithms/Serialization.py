@@ -0,0 +1,75 @@
+class TruncatedDataError(ValueError):
+    """Данных недостаточно: структура обрывается до своего конца"""
+
+
+def write_varint(buffer, value):
+    """
+    Запись неотрицательного целого в формате LEB128 (7 бит на байт)
+
+    Args:
+        buffer (bytearray): Выходной буфер
+        value (int): Записываемое число
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, pos):
+    """
+    Args:
+        data (bytes | memoryview): Входные данные
+        pos (int): Позиция начала числа
+
+    Returns:
+        tuple: (значение, позиция после числа)
+    """
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise TruncatedDataError("Неожиданный конец данных")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def write_bytes(buffer, data):
+    """Запись байтов с префиксом длины"""
+    write_varint(buffer, len(data))
+    buffer += data
+
+
+def read_bytes(data, pos):
+    """
+    Returns:
+        tuple: (байты, позиция после них)
+    """
+    length, pos = read_varint(data, pos)
+    if pos + length > len(data):
+        raise TruncatedDataError("Неожиданный конец данных")
+    return data[pos:pos + length], pos + length
+
+
+def symbol_to_int(symbol):
+    """Символ строки - кодовая точка, байт (целое 0..255) - как есть"""
+    return ord(symbol) if isinstance(symbol, str) else symbol
+
+
+def int_to_symbol(value, is_text):
+    return chr(value) if is_text else value
+
+
+def is_text_symbols(symbols):
+    """
+    Args:
+        symbols (iterable): Символы (ключи таблицы, алфавит и т.п.)
+
+    Returns:
+        bool: True, если символы - строки (пустой набор считается текстом)
+    """
+    return isinstance(next(iter(symbols), ''), str)
@@ -0,0 +1,129 @@
+import math
+from collections import Counter
+
+try:
+    import numpy
+except ImportError:  # Без NumPy используются Counter и zip (медленнее, но без зависимостей)
+    numpy = None
+
+
+# Частоты k-грамм считаются bincount, пока число возможных значений не больше 2^BINCOUNT_BITS
+BINCOUNT_BITS = 24
+
+
+def histogram(data):
+    """
+    Частоты символов. Результат не кэшируется: чтобы считать статистику набора данных один раз,
+    ее передают явно (см. entropy)
+
+    Args:
+        data (str | bytes | bytearray | memoryview): Данные
+
+    Returns:
+        dict: Символ (str для строки, целое 0..255 для байтов) -> число вхождений
+    """
+    if numpy is None or not data:
+        return dict(Counter(data))
+
+    codes, _ = symbol_array(data)
+    counts = numpy.bincount(codes)
+    symbols = numpy.flatnonzero(counts)
+    values = counts[symbols].tolist()
+    symbols = symbols.tolist()
+    if isinstance(data, str):
+        symbols = map(chr, symbols)
+    return dict(zip(symbols, values))
+
+
+def entropy(data, order=0, frequencies=None):
+    """
+    Энтропия в битах на символ; для order > 0 - условная энтропия символа
+    при известных order предыдущих символах
+
+    Args:
+        data (str | bytes | bytearray | memoryview): Данные
+        order (int): Порядок контекста (0, 1, 2, ...)
+        frequencies (dict): Заранее посчитанный histogram(data) - используется при order = 0
+
+    Returns:
+        float: Энтропия в битах на символ
+    """
+    total = len(data) - order
+    if total <= 0:
+        return 0.0
+    if order == 0:
+        if frequencies is None:
+            frequencies = histogram(data)
+        return _entropy_from_counts(list(frequencies.values()), total)
+
+    # H(X | контекст) = H(контекст, X) - H(контекст) по одним и тем же позициям
+    if numpy is not None:
+        joint_counts, context_counts = _gram_counts_numpy(data, order)
+    else:
+        joint_counts, context_counts = _gram_counts(data, order)
+    return _entropy_from_counts(joint_counts, total) - _entropy_from_counts(context_counts, total)
+
+
+def symbol_array(data):
+    """
+    Args:
+        data (str | bytes | bytearray | memoryview): Данные (требуется NumPy)
+
+    Returns:
+        tuple: (массив NumPy кодов символов без копирования байтов, число бит на код)
+    """
+    if isinstance(data, str):
+        return numpy.frombuffer(data.encode('utf-32-le'), dtype='<u4'), 21
+    return numpy.frombuffer(data, dtype=numpy.uint8), 8
+
+
+def _gram_counts(data, order):
+    """Частоты (order + 1)-грамм и их контекстов через Counter"""
+    n = len(data)
+    joint = Counter(zip(*(data[i:n - order + i] for i in range(order + 1))))
+    contexts = Counter()
+    for gram, count in joint.items():
+        contexts[gram[:-1]] += count
+    return list(joint.values()), list(contexts.values())
+
+
+def _gram_counts_numpy(data, order):
+    """Частоты (order + 1)-грамм и их контекстов: k-грамма упаковывается в одно целое uint64"""
+    codes, bits = symbol_array(data)
+    n = len(codes)
+    if bits * (order + 1) > 64:
+        return _gram_counts_rows(codes, order)
+
+    joint = codes[:n - order].astype(numpy.uint64)
+    for i in range(1, order + 1):
+        joint = (joint << numpy.uint64(bits)) | codes[i:n - order + i]
+    contexts = joint >> numpy.uint64(bits)
+    return _count_values(joint, bits * (order + 1)), _count_values(contexts, bits * order)
+
+
+def _gram_counts_rows(codes, order):
+    """Частоты k-грамм, не помещающихся в uint64: k-грамма - строка матрицы из order + 1 столбцов"""
+    n = len(codes)
+    grams = numpy.stack([codes[i:n - order + i] for i in range(order + 1)], axis=1)
+    joint, joint_counts = numpy.unique(grams, axis=0, return_counts=True)
+    # Контекст - все символы k-граммы, кроме последнего; его частота - сумма частот k-грамм с ним
+    _, inverse = numpy.unique(joint[:, :-1], axis=0, return_inverse=True)
+    context_counts = numpy.bincount(inverse.ravel(), weights=joint_counts)
+    return joint_counts, context_counts
+
+
+def _count_values(values, bits):
+    if bits <= BINCOUNT_BITS:
+        counts = numpy.bincount(values.astype(numpy.intp))
+        return counts[counts > 0]
+    return numpy.unique(values, return_counts=True)[1]
+
+
+def _entropy_from_counts(counts, total):
+    """H = log2(N) - sum(c * log2(c)) / N"""
+    if numpy is not None and not isinstance(counts, list):
+        counts = counts.astype(numpy.float64)
+        weighted = float((counts * numpy.log2(counts)).sum())
+    else:
+        weighted = sum(count * math.log2(count) for count in counts)
+    return math.log2(total) - weighted / total
@@ -0,0 +1,185 @@
+from array import array
+
+
+def build_suffix_array(symbols):
+    """
+    Построение суффиксного массива за линейное время (SA-IS)
+
+    Args:
+        symbols (sequence): Последовательность целых чисел или символов
+
+    Returns:
+        array: Суффиксный массив (array('q'))
+    """
+    n = len(symbols)
+    if n == 0:
+        return array('q')
+
+    # Плотные ранги 1..sigma, 0 зарезервирован под уникальный минимальный сентинел
+    alphabet = {symbol: rank for rank, symbol in enumerate(sorted(set(symbols)), 1)}
+    s = [alphabet[symbol] for symbol in symbols]
+    s.append(0)
+
+    sa = _sais(s, len(alphabet) + 1)
+    # Первый элемент - суффикс из одного сентинела
+    return array('q', sa[1:])
+
+
+def _bucket_heads(counts):
+    heads = [0] * len(counts)
+    total = 0
+    for c, count in enumerate(counts):
+        heads[c] = total
+        total += count
+    return heads
+
+
+def _bucket_tails(counts):
+    tails = [0] * len(counts)
+    total = 0
+    for c, count in enumerate(counts):
+        total += count
+        tails[c] = total
+    return tails
+
+
+def _induce(s, types, sa, counts):
+    """Индуцированная сортировка L- и S-суффиксов по уже расставленным LMS-суффиксам"""
+    n = len(s)
+
+    heads = _bucket_heads(counts)
+    for i in range(n):
+        j = sa[i] - 1
+        if j >= 0 and not types[j]:
+            c = s[j]
+            sa[heads[c]] = j
+            heads[c] += 1
+
+    tails = _bucket_tails(counts)
+    for i in range(n - 1, -1, -1):
+        j = sa[i] - 1
+        if j >= 0 and types[j]:
+            c = s[j]
+            tails[c] -= 1
+            sa[tails[c]] = j
+
+
+def _sais(s, k):
+    """
+    Args:
+        s (list): Строка из чисел 0..k-1, оканчивающаяся единственным нулем
+        k (int): Размер алфавита
+
+    Returns:
+        list: Суффиксный массив s
+    """
+    n = len(s)
+    if n == 1:
+        return [0]
+
+    # Типы суффиксов: 1 - S (меньше следующего), 0 - L
+    types = bytearray(n)
+    types[n - 1] = 1
+    for i in range(n - 2, -1, -1):
+        if s[i] < s[i + 1] or (s[i] == s[i + 1] and types[i + 1]):
+            types[i] = 1
+
+    counts = [0] * k
+    for c in s:
+        counts[c] += 1
+
+    lms = [i for i in range(1, n) if types[i] and not types[i - 1]]
+
+    # 1. Приближенная сортировка LMS-подстрок
+    sa = [-1] * n
+    tails = _bucket_tails(counts)
+    for i in reversed(lms):
+        c = s[i]
+        tails[c] -= 1
+        sa[tails[c]] = i
+    _induce(s, types, sa, counts)
+
+    # 2. Именование LMS-подстрок
+    names = [-1] * n
+    name = -1
+    previous = -1
+    for p in sa:
+        if p > 0 and types[p] and not types[p - 1]:
+            if previous < 0 or not _lms_equal(s, types, previous, p):
+                name += 1
+            names[p] = name
+            previous = p
+    reduced = [names[p] for p in lms]
+
+    # 3. Порядок LMS-суффиксов: рекурсивно, если имена не уникальны
+    if name + 1 < len(lms):
+        reduced_sa = _sais(reduced, name + 1)
+    else:
+        reduced_sa = [0] * len(lms)
+        for i, c in enumerate(reduced):
+            reduced_sa[c] = i
+
+    # 4. Окончательная индуцированная сортировка
+    sa = [-1] * n
+    tails = _bucket_tails(counts)
+    for index in reversed(reduced_sa):
+        p = lms[index]
+        c = s[p]
+        tails[c] -= 1
+        sa[tails[c]] = p
+    _induce(s, types, sa, counts)
+
+    return sa
+
+
+def _lms_equal(s, types, a, b):
+    """Сравнение LMS-подстрок, начинающихся в позициях a и b"""
+    n = len(s)
+    if a == n - 1 or b == n - 1:
+        return False
+
+    d = 0
+    while True:
+        if s[a + d] != s[b + d] or types[a + d] != types[b + d]:
+            return False
+        if d > 0:
+            a_lms = types[a + d] and not types[a + d - 1]
+            b_lms = types[b + d] and not types[b + d - 1]
+            if a_lms and b_lms:
+                return True
+            if a_lms != b_lms:
+                return False
+        d += 1
+
+
+def build_lcp_array(symbols, sa):
+    """
+    Построение массива LCP алгоритмом Касаи
+
+    Args:
+        symbols (sequence): Последовательность целых чисел
+        sa (sequence): Суффиксный массив этой последовательности
+
+    Returns:
+        array: lcp[i] - длина общего префикса суффиксов sa[i - 1] и sa[i]
+    """
+    n = len(sa)
+    rank = array('q', [0]) * n
+    for i in range(n):
+        rank[sa[i]] = i
+
+    lcp = array('q', [0]) * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r > 0:
+            j = sa[r - 1]
+            while i + h < n and j + h < n and symbols[i + h] == symbols[j + h]:
+                h += 1
+            lcp[r] = h
+            if h > 0:
+                h -= 1
+        else:
+            h = 0
+
+    return lcp
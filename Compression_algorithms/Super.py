@@ -1,7 +1,15 @@
 import sys
 
+from Compression_algorithms import Container
+from Compression_algorithms.Serialization import TruncatedDataError
+
 
 class CompressionAlgorithm:
+    # Размер блока потокового сжатия (в символах входных данных)
+    stream_block_size = 1 << 18
+    # Идентификатор алгоритма в заголовке контейнера
+    container_id = 0
+
     def __init__(self, name):
         self.name = name
 
@@ -11,6 +19,269 @@ class CompressionAlgorithm:
     def decompress(self, compressed_data):
         raise NotImplementedError
 
+    def decompress_data(self, compressed_data):
+        """Распаковка результата compress() независимо от сигнатуры decompress"""
+        return self.decompress(compressed_data)
+
+    def to_bytes(self, compressed_data):
+        """Сериализация результата compress() в байты"""
+        raise NotImplementedError
+
+    def from_bytes(self, data):
+        """Восстановление результата compress() из байтов to_bytes()"""
+        raise NotImplementedError
+
+    def get_params(self):
+        """Целочисленные параметры, необходимые для распаковки (записываются в контейнер)"""
+        return {}
+
+    def check_header(self, algorithm_id, params):
+        """
+        Проверка, что контейнер записан этим алгоритмом с теми же параметрами
+
+        Args:
+            algorithm_id (int): Идентификатор алгоритма из заголовка
+            params (dict): Параметры из заголовка
+        """
+        if algorithm_id != self.container_id:
+            raise ValueError(f"Контейнер записан другим алгоритмом: {algorithm_id}")
+        expected = {name: int(value) for name, value in self.get_params().items()}
+        if params != expected:
+            raise ValueError(f"Параметры контейнера {params} не совпадают с параметрами алгоритма {expected}")
+
+    def save_compressed(self, compressed_data, raw_length, filename, is_text=True):
+        """
+        Запись результата compress() в файл-контейнер из одного блока
+
+        Args:
+            compressed_data: Результат compress()
+            raw_length (int): Длина исходных данных
+            filename (str): Имя файла
+            is_text (bool): Исходные данные были строкой
+        """
+        buffer = bytearray()
+        Container.write_header(buffer, self.container_id, Container.FLAG_TEXT if is_text else 0, self.get_params())
+        index = [(len(buffer), raw_length)]
+        Container.write_block(buffer, raw_length, self.to_bytes(compressed_data))
+        Container.write_end(buffer, index)
+        with open(filename, 'wb') as file:
+            file.write(buffer)
+
+    def load_compressed(self, filename):
+        """
+        Returns:
+            Результат compress(), сохраненный save_compressed
+        """
+        with open(filename, 'rb') as file:
+            reader = Container.ContainerReader(file.read())
+        self.check_header(reader.algorithm_id, reader.params)
+        return self.from_bytes(reader.block(0))
+
+    def compressor(self, block_size=None, is_text=None):
+        """
+        Args:
+            block_size (int): Размер блока (по умолчанию - stream_block_size)
+            is_text (bool): Тип входных данных; None - определяется по первой порции
+
+        Returns:
+            StreamCompressor: Потоковый компрессор с методами feed(chunk) / flush()
+        """
+        return StreamCompressor(self, block_size or self.stream_block_size, is_text)
+
+    def decompressor(self, is_text=None):
+        """
+        Args:
+            is_text (bool): Ожидаемый тип данных; None - определяется по заголовку контейнера
+
+        Returns:
+            StreamDecompressor: Потоковый декомпрессор с методами feed(data) / flush()
+        """
+        return StreamDecompressor(self, is_text)
+
+    def compress_stream(self, source, target, chunk_size=1 << 16):
+        """
+        Args:
+            source: Файловый объект с методом read (текстовый или двоичный режим)
+            target: Файловый объект с методом write (двоичный режим)
+            chunk_size (int): Размер читаемой порции
+        """
+        compressor = self.compressor()
+        while True:
+            chunk = source.read(chunk_size)
+            # Пустая порция тоже передается: по ее типу определяется тип данных пустого источника
+            target.write(compressor.feed(chunk))
+            if not chunk:
+                break
+        target.write(compressor.flush())
+
+    def decompress_stream(self, source, target, chunk_size=1 << 16):
+        """
+        Args:
+            source: Файловый объект с методом read (двоичный режим)
+            target: Файловый объект с методом write (режим, соответствующий исходным данным)
+            chunk_size (int): Размер читаемой порции
+        """
+        decompressor = self.decompressor()
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            output = decompressor.feed(chunk)
+            if output:
+                target.write(output)
+        decompressor.flush()
+
     @staticmethod
     def get_encoded_size(compressed_data):
-        return sys.getsizeof(compressed_data)
\ No newline at end of file
+        return sys.getsizeof(compressed_data)
+
+
+class StreamCompressor:
+    """Потоковое сжатие в контейнер: входные данные режутся на независимые блоки"""
+
+    def __init__(self, algorithm, block_size, is_text=None):
+        """
+        Args:
+            algorithm (CompressionAlgorithm): Алгоритм сжатия блоков
+            block_size (int): Размер блока
+            is_text (bool): Тип входных данных; None - определяется по первой порции (в том числе пустой)
+        """
+        self.algorithm = algorithm
+        self.block_size = block_size
+        self.pending = []
+        self.pending_size = 0
+        self.header_written = False
+        self.is_text = is_text
+        self.offset = 0
+        self.index = []
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk (str | bytes | bytearray | memoryview): Очередная порция входных данных
+
+        Returns:
+            bytes: Заголовок контейнера (при первом вызове) и записи всех заполненных блоков
+        """
+        if not isinstance(chunk, str):
+            chunk = bytes(chunk)
+        output = bytearray()
+        self._write_header(output, chunk)
+
+        if chunk:
+            self.pending.append(chunk)
+            self.pending_size += len(chunk)
+        if self.pending_size >= self.block_size:
+            data = self._join(self.pending)
+            start = 0
+            while len(data) - start >= self.block_size:
+                self._write_block(output, data[start:start + self.block_size])
+                start += self.block_size
+
+            rest = data[start:]
+            self.pending = [rest] if rest else []
+            self.pending_size = len(rest)
+
+        return self._emit(output)
+
+    def flush(self):
+        """
+        Returns:
+            bytes: Последний неполный блок и запись конца контейнера с индексом блоков
+        """
+        output = bytearray()
+        if not self.header_written and self.is_text is None:
+            raise ValueError("Тип данных неизвестен: не было ни одной порции, задайте is_text")
+        self._write_header(output, None)
+        if self.pending_size:
+            self._write_block(output, self._join(self.pending))
+        self.pending = []
+        self.pending_size = 0
+
+        # Смещения в индексе считаются от начала контейнера
+        Container.write_end(output, self.index, self.offset + len(output))
+        return self._emit(output)
+
+    def _write_header(self, output, chunk):
+        if self.header_written:
+            return
+        if self.is_text is None:
+            self.is_text = isinstance(chunk, str)
+        flags = Container.FLAG_TEXT if self.is_text else 0
+        Container.write_header(output, self.algorithm.container_id, flags, self.algorithm.get_params())
+        self.header_written = True
+
+    def _write_block(self, output, block):
+        self.index.append((self.offset + len(output), len(block)))
+        payload = self.algorithm.to_bytes(self.algorithm.compress(block))
+        Container.write_block(output, len(block), payload)
+
+    def _join(self, parts):
+        return ''.join(parts) if self.is_text else b''.join(parts)
+
+    def _emit(self, output):
+        self.offset += len(output)
+        return bytes(output)
+
+
+class StreamDecompressor:
+    """Потоковая распаковка контейнера, записанного StreamCompressor"""
+
+    def __init__(self, algorithm, is_text=None):
+        """
+        Args:
+            algorithm (CompressionAlgorithm): Алгоритм распаковки блоков
+            is_text (bool): Ожидаемый тип данных; None - тип известен только после чтения заголовка
+        """
+        self.algorithm = algorithm
+        self.buffer = bytearray()
+        self.is_text = is_text
+        self.header_read = False
+        self.finished = False
+
+    def feed(self, data):
+        """
+        Args:
+            data (bytes): Очередная порция сжатых данных
+
+        Returns:
+            str | bytes | None: Данные всех полностью полученных блоков;
+                None, пока заголовок не получен и тип данных не задан
+        """
+        self.buffer += data
+        parts = []
+        pos = 0
+        try:
+            if not self.header_read:
+                algorithm_id, flags, params, pos = Container.read_header(self.buffer)
+                self.algorithm.check_header(algorithm_id, params)
+                is_text = bool(flags & Container.FLAG_TEXT)
+                if self.is_text is not None and self.is_text != is_text:
+                    raise ValueError("Тип данных в заголовке контейнера не совпадает с ожидаемым")
+                self.is_text = is_text
+                self.header_read = True
+
+            while not self.finished and pos < len(self.buffer):
+                if self.buffer[pos] == Container.RECORD_END:
+                    _, pos = Container.read_end(self.buffer, pos)
+                    self.finished = True
+                    break
+
+                _, payload, pos = Container.read_block(self.buffer, pos)
+                parts.append(self.algorithm.decompress_data(self.algorithm.from_bytes(payload)))
+        except TruncatedDataError:
+            pass
+
+        del self.buffer[:pos]
+        return self._join(parts)
+
+    def flush(self):
+        """Проверка, что поток закончился записью конца контейнера"""
+        if not self.finished:
+            raise ValueError("Поток сжатых данных оборван")
+        return self._join([])
+
+    def _join(self, parts):
+        if self.is_text is None:
+            return None
+        return ''.join(parts) if self.is_text else b''.join(parts)
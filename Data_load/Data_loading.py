@@ -1,16 +1,218 @@
+import functools
+import itertools
+import mmap
 import random
 import string
+import struct
+
+# Порция генерации: большие наборы собираются из порций, чтобы не держать списки символов целиком
+CHUNK_SIZE = 1 << 20
+
+KB = 1 << 10
+MB = 1 << 20
+GB = 1 << 30
+
+
+def format_size(size):
+    """Размер в байтах -> '64 KB', '1 GB' и т.п."""
+    for unit, name in ((GB, "GB"), (MB, "MB"), (KB, "KB")):
+        if size >= unit and size % unit == 0:
+            return f"{size // unit} {name}"
+    return f"{size} B"
+
 
 class DataLoader:
     """Класс для загрузки тестовых данных"""
+
+    # Виды генерируемых наборов: текстовые возвращаются строкой (ASCII - размер в байтах равен длине),
+    # двоичные - байтами
+    TEXT_KINDS = ("low_entropy", "repetitive", "natural", "logs")
+    BINARY_KINDS = ("random", "binary")
+    KINDS = TEXT_KINDS + BINARY_KINDS
+
     def load_file(self, file_path, file_type="text"):
-        """Загружает данные из файла"""
+        """
+        Загружает данные из файла
+
+        Args:
+            file_path (str): Путь к файлу
+            file_type (str): "text" - строка, "binary" - байты,
+                "mmap" - memoryview отображения файла без чтения в память целиком
+
+        Returns:
+            str | bytes | memoryview: Данные файла
+        """
         if file_type == "text":
             with open(file_path, 'r', encoding='utf-8') as f:
                 return f.read()
         elif file_type == "binary":
             with open(file_path, 'rb') as f:
                 return f.read()
+        elif file_type == "mmap":
+            return memoryview(self.map_file(file_path))
         else:
             raise ValueError(f"Неподдерживаемый тип файла: {file_type}")
 
+    def map_file(self, file_path):
+        """
+        Отображение файла в память только для чтения: данные подгружаются ОС по мере обращения
+
+        Returns:
+            mmap.mmap | bytes: Отображение (пустой файл отобразить нельзя - возвращается b"")
+        """
+        with open(file_path, 'rb') as f:
+            try:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b""
+
+    def generate(self, kind, size, seed=0):
+        """
+        Воспроизводимый набор данных заданного вида и размера
+
+        Args:
+            kind (str): Вид набора из KINDS
+            size (int): Размер в байтах
+            seed (int): Зерно генератора: одинаковые (kind, size, seed) дают одинаковые данные
+
+        Returns:
+            str | bytes: Строка для текстовых видов, байты для двоичных
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Неизвестный вид набора данных: {kind}")
+        rng = random.Random(f"{kind}:{seed}")
+        make_chunk = getattr(self, f"_generate_{kind}")(rng)
+
+        chunks = []
+        produced = 0
+        while produced < size:
+            chunk = make_chunk(min(CHUNK_SIZE, size - produced))
+            chunks.append(chunk)
+            produced += len(chunk)
+
+        empty = "" if kind in self.TEXT_KINDS else b""
+        return empty.join(chunks)[:size]
+
+    def corpus(self, kinds=KINDS, sizes=(KB, 64 * KB), seed=0, files=()):
+        """
+        Наборы данных для матрицы размер x набор x алгоритм. Наборы не строятся заранее:
+        каждый создается вызовом своей функции и может быть освобожден до создания следующего
+
+        Args:
+            kinds (iterable): Виды генерируемых наборов
+            sizes (iterable): Размеры в байтах
+            seed (int): Зерно генераторов
+            files (iterable): Пути существующих файлов (отображаются в память, передаются как memoryview байтов)
+
+        Yields:
+            tuple: ("вид размер", функция без аргументов, возвращающая данные)
+        """
+        for kind in kinds:
+            for size in sizes:
+                yield f"{kind} {format_size(size)}", functools.partial(self.generate, kind, size, seed)
+        for file_path in files:
+            yield file_path, functools.partial(self.load_file, file_path, "mmap")
+
+    @staticmethod
+    def _generate_random(rng):
+        """Равномерно случайные байты - несжимаемые данные"""
+        return rng.randbytes
+
+    @staticmethod
+    def _generate_binary(rng):
+        """Записи фиксированной длины: возрастающий счетчик, малые целые и числа с плавающей точкой"""
+        record = struct.Struct('<IHhf')
+        state = {"counter": rng.randrange(1 << 16)}
+
+        def make_chunk(size):
+            buffer = bytearray()
+            counter = state["counter"]
+            while len(buffer) < size:
+                counter += rng.randrange(1, 16)
+                buffer += record.pack(counter & 0xFFFFFFFF, rng.randrange(8), rng.randrange(-100, 100),
+                                      round(rng.gauss(0, 10), 2))
+            state["counter"] = counter
+            return bytes(buffer)
+
+        return make_chunk
+
+    @staticmethod
+    def _generate_low_entropy(rng):
+        """Несколько символов с сильно неравномерными частотами"""
+        alphabet = rng.sample(string.ascii_letters, 6)
+        weights = [2 ** -i for i in range(len(alphabet))]
+        return lambda size: ''.join(rng.choices(alphabet, weights, k=size))
+
+    @staticmethod
+    def _generate_repetitive(rng):
+        """Повторы одной фразы с редкими изменениями - длинные совпадения для LZ77 и BWT"""
+        phrase = ''.join(rng.choices(string.ascii_lowercase + ' ', k=rng.randrange(20, 80)))
+
+        def make_chunk(size):
+            parts = []
+            produced = 0
+            while produced < size:
+                part = phrase
+                if rng.random() < 0.1:
+                    pos = rng.randrange(len(part))
+                    part = part[:pos] + rng.choice(string.ascii_lowercase) + part[pos + 1:]
+                parts.append(part)
+                produced += len(part)
+            return ''.join(parts)
+
+        return make_chunk
+
+    @staticmethod
+    def _make_vocabulary(rng, count):
+        words = set()
+        while len(words) < count:
+            length = max(1, min(12, int(rng.gauss(5, 2))))
+            words.add(''.join(rng.choices(string.ascii_lowercase, k=length)))
+        return sorted(words)
+
+    @staticmethod
+    def _generate_natural(rng):
+        """Предложения из слов с частотами по закону Ципфа"""
+        vocabulary = DataLoader._make_vocabulary(rng, 5000)
+        rng.shuffle(vocabulary)
+        # Накопленные веса вычисляются один раз, а не при каждом вызове choices
+        cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def make_chunk(size):
+            sentences = []
+            produced = 0
+            while produced < size:
+                words = rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randrange(4, 20))
+                sentence = ' '.join(words).capitalize() + rng.choice('...!?') + (' ' if rng.random() < 0.9 else '\n')
+                sentences.append(sentence)
+                produced += len(sentence)
+            return ''.join(sentences)
+
+        return make_chunk
+
+    @staticmethod
+    def _generate_logs(rng):
+        """Строки журнала: возрастающее время, уровень, сервис, сообщение с параметрами"""
+        services = DataLoader._make_vocabulary(rng, 8)
+        messages = [' '.join(DataLoader._make_vocabulary(rng, rng.randrange(2, 6))) for _ in range(40)]
+        levels = ("DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR")
+        state = {"time": 1_700_000_000.0}
+
+        def make_chunk(size):
+            lines = []
+            produced = 0
+            timestamp = state["time"]
+            while produced < size:
+                timestamp += rng.expovariate(20)
+                seconds = int(timestamp)
+                line = (f"{seconds // 86400 % 28 + 1:02d}.01.2024 "
+                        f"{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}."
+                        f"{int(timestamp * 1000) % 1000:03d} {rng.choice(levels)} "
+                        f"{rng.choice(services)}[{rng.randrange(1000, 1100)}]: {rng.choice(messages)} "
+                        f"id={rng.randrange(1 << 20)} took={rng.randrange(1, 5000)}ms\n")
+                lines.append(line)
+                produced += len(line)
+            state["time"] = timestamp
+            return ''.join(lines)
+
+        return make_chunk
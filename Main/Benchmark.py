@@ -1,11 +1,12 @@
 import sys
 
 from Testing_tools.Compress_test import CompressionTester
-from Data_load.Data_loading import DataLoader
+from Data_load.Data_loading import DataLoader, KB
 from Testing_tools.Visualise import ResultVisualizer
 from Compression_algorithms.Huffman2 import HuffmanCoding
 from Compression_algorithms.Arithmetic import ArithmeticCoding
 from Compression_algorithms.BWT import BWT
+from Compression_algorithms.BWT_blocks import BlockBWT
 from Compression_algorithms.LZ77 import LZ77
 
 class EncodingBenchmark:
@@ -28,6 +29,30 @@ class EncodingBenchmark:
         """Запускает тестирование всех алгоритмов"""
         return self.tester.test_all(data)
 
+    def run_matrix(self, kinds=DataLoader.KINDS, sizes=(KB, 64 * KB), seed=0, files=(), concurrent=False, **limits):
+        """
+        Матрица размер x набор данных x алгоритм для кривых масштабирования
+
+        Args:
+            kinds (iterable): Виды генерируемых наборов (DataLoader.KINDS)
+            sizes (iterable): Размеры наборов в байтах
+            seed (int): Зерно генераторов
+            files (iterable): Существующие файлы, добавляемые в матрицу
+            concurrent (bool): Каждая пара (набор, алгоритм) в отдельном процессе
+            **limits: workers, timeout, memory_limit для параллельного режима
+
+        Returns:
+            dict: "вид размер: алгоритм" -> метрики
+        """
+        datasets = self.data_loader.corpus(kinds, sizes, seed, files)
+        if concurrent:
+            return self.run_concurrent_benchmark(datasets, **limits)
+        return self.tester.test_datasets(datasets)
+
+    def run_concurrent_benchmark(self, datasets, workers=None, timeout=None, memory_limit=None):
+        """Запускает каждую пару (набор данных, алгоритм) в отдельном процессе"""
+        return self.tester.test_concurrent(datasets, workers, timeout, memory_limit)
+
     def show_results(self, results):
         """Отображает результаты тестирования"""
         self.visualizer.print_table(results)
@@ -39,14 +64,20 @@ def main():
     algorithm2 = ArithmeticCoding()
     algorithm3 = BWT()
     algorithm4 = LZ77()
-    algorithms = [algorithm1, algorithm2, algorithm3, algorithm4]
+    algorithm5 = BlockBWT()
+    algorithms = [algorithm1, algorithm2, algorithm3, algorithm4, algorithm5]
+    # Уровни LZ77: время разбора против степени сжатия
+    algorithms += [LZ77(level=level) for level in (2, 3, 4)]
     for alg in algorithms: benchmark.register_algorithm(alg)
 
 
-    # Загрузка тестовых данных из файла
-    data = benchmark.load_test_data(".\sample_text.txt")
-    print(sys.getsizeof(data))
-    results = benchmark.run_benchmark(data)
+    # Файл из командной строки или сгенерированная матрица наборов данных
+    if len(sys.argv) > 1:
+        data = benchmark.load_test_data(sys.argv[1])
+        print(sys.getsizeof(data))
+        results = benchmark.run_benchmark(data)
+    else:
+        results = benchmark.run_matrix()
 
     # Отображение результатов
     benchmark.show_results(results)
@@ -1,14 +1,37 @@
+import os
+import signal
 import sys
 import time
+import multiprocessing
+from multiprocessing.connection import wait
 from Testing_tools.Metrics import CompressionMetrics
-from decimal import Decimal
+from Testing_tools.Timing import Timer
+from Testing_tools.Memory import MemoryProfiler
+
+try:
+    import resource
+except ImportError:  # Ограничение памяти доступно только на Unix
+    resource = None
+
+
+class RoundTripError(AssertionError):
+    """Распакованные данные не совпадают с исходными"""
+
 
 class CompressionTester:
     """Класс для тестирования и сравнения алгоритмов кодирования"""
 
-    def __init__(self):
+    def __init__(self, repeat=5, warmup=1, profile_memory=True):
+        """
+        Args:
+            repeat (int): Число замеряемых запусков сжатия и распаковки
+            warmup (int): Число прогревочных запусков перед замерами
+            profile_memory (bool): Замерять память сжатия и распаковки (отдельными запусками)
+        """
         self.algorithms = []
         self.results = {}
+        self.timer = Timer(repeat, warmup)
+        self.memory_profiler = MemoryProfiler() if profile_memory else None
 
     def add_algorithm(self, algorithm):
         """Добавляет алгоритм в список для тестирования"""
@@ -17,11 +40,150 @@ class CompressionTester:
     def test_all(self, data):
         """Тестирует все зарегистрированные алгоритмы на указанных данных"""
         for algorithm in self.algorithms:
-            self.results[algorithm.name] = self._test_single_algorithm(algorithm, data)
+            try:
+                self.results[algorithm.name] = self._test_single_algorithm(algorithm, data)
+            except RoundTripError as error:
+                self.results[algorithm.name] = {"error": str(error)}
+        return self.results
+
+    def test_datasets(self, datasets):
+        """
+        Тестирует все алгоритмы на каждом наборе данных по очереди; в памяти одновременно
+        находится только текущий набор
+
+        Args:
+            datasets (dict | iterable): Имя набора данных -> данные или пары (имя, данные или функция,
+                создающая данные, например из DataLoader.corpus)
+
+        Returns:
+            dict: "набор: алгоритм" -> метрики или {"error": описание ошибки}
+        """
+        for dataset_name, data in self._iter_datasets(datasets):
+            for algorithm in self.algorithms:
+                key = f"{dataset_name}: {algorithm.name}"
+                try:
+                    self.results[key] = self._test_single_algorithm(algorithm, data)
+                except RoundTripError as error:
+                    self.results[key] = {"error": str(error)}
+            # Набор освобождается до создания следующего
+            del data
         return self.results
 
+    @staticmethod
+    def _iter_datasets(datasets):
+        """Пары (имя, данные); функции, создающие данные, вызываются только при переходе к набору"""
+        if isinstance(datasets, dict):
+            datasets = datasets.items()
+        for dataset_name, data in datasets:
+            yield dataset_name, data() if callable(data) else data
+
+    def test_concurrent(self, datasets, workers=None, timeout=None, memory_limit=None):
+        """
+        Тестирует каждую пару (набор данных, алгоритм) в отдельном процессе;
+        результаты собираются по мере завершения, зависшие задания принудительно завершаются
+
+        Args:
+            datasets (dict | iterable): Наборы данных, как в test_datasets; набор создается перед запуском
+                его заданий и освобождается родителем после их запуска
+            workers (int): Число одновременно работающих процессов (по умолчанию - число ядер)
+            timeout (float): Ограничение времени одного задания в секундах
+            memory_limit (int): Ограничение адресного пространства процесса в байтах (RLIMIT_AS)
+
+        Returns:
+            dict: "набор: алгоритм" -> метрики или {"error": описание ошибки}
+        """
+        workers = workers or os.cpu_count()
+        running = {}
+        number = 0
+        for dataset_name, data in self._iter_datasets(datasets):
+            for algorithm in self.algorithms:
+                while len(running) >= workers:
+                    self._collect_finished(running, timeout)
+
+                key = f"{dataset_name}: {algorithm.name}"
+                reader, writer = multiprocessing.Pipe(duplex=False)
+                filename = f"{type(algorithm).__name__}_{number}_compressed.bin"
+                number += 1
+                process = multiprocessing.Process(target=self._run_job,
+                                                  args=(writer, algorithm, data, filename, memory_limit))
+                process.start()
+                self._make_process_group(process.pid)
+                # Пока у родителя открыт конец записи, обрыв процесса не будет виден как EOF
+                writer.close()
+                # Объект процесса хранит аргументы: набор освобождается, когда завершатся его задания
+                running[reader] = (process, key, time.monotonic())
+            del data
 
-    def _test_single_algorithm(self, algorithm, data):
+        while running:
+            self._collect_finished(running, timeout)
+        return self.results
+
+    def _collect_finished(self, running, timeout):
+        """Ожидает завершения хотя бы одного задания или истечения срока ближайшего из них"""
+        wait_time = None
+        if timeout is not None:
+            oldest_start = min(start for _, _, start in running.values())
+            wait_time = max(0.0, oldest_start + timeout - time.monotonic())
+
+        for reader in wait(list(running), wait_time):
+            process, key, _ = running.pop(reader)
+            try:
+                self.results[key] = reader.recv()
+            except EOFError:
+                process.join()
+                self.results[key] = {"error": f"процесс завершился с кодом {process.exitcode}"}
+            reader.close()
+            process.join()
+
+        if timeout is not None:
+            now = time.monotonic()
+            for reader, (process, key, start) in list(running.items()):
+                if now - start >= timeout:
+                    self._kill_job(process)
+                    process.join()
+                    reader.close()
+                    del running[reader]
+                    self.results[key] = {"error": f"превышено время {timeout} с"}
+
+    @staticmethod
+    def _make_process_group(pid):
+        """
+        Отдельная группа процессов задания: вместе с ним завершаются и его дочерние процессы
+        (например, процесс замера RSS). Вызывается и родителем, и самим заданием, чтобы группа
+        существовала независимо от того, кто успеет первым
+        """
+        if hasattr(os, "setpgid"):
+            try:
+                os.setpgid(pid, pid)
+            except OSError:  # Процесс уже завершился или сам создал группу
+                pass
+
+    @staticmethod
+    def _kill_job(process):
+        """Принудительное завершение задания вместе со всеми процессами его группы"""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except OSError:  # Группа еще не создана
+                pass
+        process.kill()
+
+    def _run_job(self, writer, algorithm, data, filename, memory_limit):
+        """Тело процесса-задания: результат или описание ошибки отправляется родителю"""
+        self._make_process_group(0)
+        if memory_limit is not None and resource is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        try:
+            result = self._test_single_algorithm(algorithm, data, filename)
+        except MemoryError:
+            result = {"error": "превышен лимит памяти"}
+        except Exception as error:
+            result = {"error": f"{type(error).__name__}: {error}"}
+        writer.send(result)
+        writer.close()
+
+    def _test_single_algorithm(self, algorithm, data, filename=None):
         """Тестирует отдельный алгоритм и собирает метрики"""
         result = {}
 
@@ -29,32 +191,41 @@ class CompressionTester:
         original_size = len(data) * 8
         result["original_size"] = original_size
 
-        # Замер времени кодирования
-        start_time = Decimal(time.time())
-        encoded_data = algorithm.compress(data)
-        encoding_time = Decimal(time.time()) - start_time
+        # Замер времени кодирования и декодирования (медиана нескольких запусков после прогрева)
+        encoded_data, encoding = self.timer.measure(algorithm.compress, data)
+        decoded_data, decoding = self.timer.measure(algorithm.decompress_data, encoded_data)
+
+        # Обязательная проверка: замеры неисправного алгоритма не попадают в результаты
+        expected = data if isinstance(data, str) else bytes(data)
+        if decoded_data != expected:
+            raise RoundTripError(f"{algorithm.name}: распакованные данные не совпадают с исходными")
 
-        # Сбор метрик
+        # Сбор метрик (скорость - в байтах исходных данных в секунду)
         encoded_size = algorithm.get_encoded_size(encoded_data)
+        data_size = original_size // 8
         result["encoded_size"] = encoded_size
-        result["encoding_time"] = encoding_time
         result["compression_ratio"] = CompressionMetrics.compression_ratio(original_size, encoded_size)
         result["space_saving"] = CompressionMetrics.space_saving(original_size, encoded_size)
-        result["encoding_speed"] = CompressionMetrics.encoding_speed(original_size, encoding_time)
-
-        algorithm_name = type(algorithm).__name__
-        filename = f"{algorithm_name}_compressed.txt"
-
-        if isinstance(encoded_data, str):
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(encoded_data)
-        elif isinstance(encoded_data, list):
-            import json
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(encoded_data, f)
-        else:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(str(encoded_data))
+        for prefix, timing in (("encoding", encoding), ("decoding", decoding)):
+            result[f"{prefix}_time"] = timing["median"]
+            result[f"{prefix}_time_p95"] = timing["p95"]
+            result[f"{prefix}_time_stdev"] = timing["stdev"]
+            result[f"{prefix}_speed"] = CompressionMetrics.encoding_speed(data_size, timing["median"])
+
+        # Память замеряется отдельно: tracemalloc замедляет выполнение и исказил бы время
+        if self.memory_profiler is not None:
+            profiler = self.memory_profiler
+            for prefix, function, argument in (("encoding", algorithm.compress, data),
+                                               ("decoding", algorithm.decompress_data, encoded_data)):
+                _, memory = profiler.measure(function, argument)
+                result[f"{prefix}_peak_memory"] = memory["peak"]
+                result[f"{prefix}_blocks"] = memory["blocks"]
+                result[f"{prefix}_peak_rss"] = profiler.peak_rss(function, argument)
+
+        # Сохранение результата в бинарный контейнер
+        if filename is None:
+            filename = f"{type(algorithm).__name__}_compressed.bin"
+        algorithm.save_compressed(encoded_data, len(data), filename, isinstance(data, str))
 
         return result
 
@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import sys
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Пиковый RSS доступен только на Unix
+    resource = None
+
+
+class MemoryProfiler:
+    """Замер памяти одного вызова функции: пик tracemalloc, число блоков и пиковый RSS в отдельном процессе"""
+
+    def measure(self, function, *args):
+        """
+        Args:
+            function (callable): Замеряемая функция
+            *args: Ее аргументы
+
+        Returns:
+            tuple: (результат, {"peak": пик выделенной памяти в байтах,
+                                "blocks": число блоков памяти, удерживаемых результатом})
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            base_memory, _ = tracemalloc.get_traced_memory()
+            base_blocks = sys.getallocatedblocks()
+
+            result = function(*args)
+
+            _, peak = tracemalloc.get_traced_memory()
+            blocks = sys.getallocatedblocks() - base_blocks
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        return result, {"peak": peak - base_memory, "blocks": max(0, blocks)}
+
+    @staticmethod
+    def peak_rss(function, *args):
+        """
+        Прирост пикового RSS при вызове функции в отдельном процессе (учитывает и память C-расширений,
+        невидимую для tracemalloc)
+
+        Returns:
+            int | None: Байты или None, если RSS недоступен на платформе
+        """
+        if resource is None:
+            return None
+
+        # spawn: дочерний процесс начинает с чистой кучей; при fork выделения переиспользуют
+        # унаследованные страницы родителя и прирост RSS получается нулевым
+        context = multiprocessing.get_context("spawn")
+        # Аргументы передаются процессу сериализацией: memoryview (отображение файла) копируется в bytes
+        args = tuple(bytes(arg) if isinstance(arg, memoryview) else arg for arg in args)
+        reader, writer = context.Pipe(duplex=False)
+        process = context.Process(target=_rss_job, args=(writer, function, args))
+        process.start()
+        writer.close()
+        try:
+            return reader.recv()
+        except EOFError:
+            return None
+        finally:
+            reader.close()
+            process.join()
+
+
+def _current_rss():
+    """Текущий RSS процесса в байтах (без /proc - пиковый, т.е. оценка сверху)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return _max_rss()
+
+
+def _max_rss():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss - килобайты на Linux и байты на macOS
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def _rss_job(writer, function, args):
+    try:
+        before = _current_rss()
+        function(*args)
+        writer.send(max(0, _max_rss() - before))
+    except MemoryError:
+        writer.send(None)
+    finally:
+        writer.close()
@@ -1,5 +1,4 @@
-import math
-import collections
+from Compression_algorithms import Statistics
 
 
 class CompressionMetrics:
@@ -7,7 +6,7 @@ class CompressionMetrics:
     @staticmethod
     def compression_ratio(original_size, encoded_size):
         """Вычисляет коэффициент сжатия"""
-        return (original_size - encoded_size)/ original_size if encoded_size > 0 else 0
+        return (original_size - encoded_size)/ original_size if original_size > 0 else 0
 
     @staticmethod
     def space_saving(original_size, encoded_size):
@@ -20,20 +19,13 @@ class CompressionMetrics:
         return data_size / encoding_time if encoding_time > 0 else 0
 
     @staticmethod
-    def entropy(original_string: str):
-        """Вычисляет теоретический предел сжатия"""
+    def entropy(original_string: str, order=0, frequencies=None):
+        """Вычисляет теоретический предел сжатия (для order > 0 - условная энтропия при order предыдущих символах);
+        frequencies - уже посчитанные частоты символов набора, чтобы не считать их повторно"""
         if not original_string:
             return 0
 
-        entropy = 0.0
-        length = len(original_string)
-        freq = collections.Counter(original_string)
-
-        for count in freq.values():
-            probability = count / length
-            entropy -= probability * math.log2(probability)
-
-        return entropy
+        return Statistics.entropy(original_string, order, frequencies)
 
 
 
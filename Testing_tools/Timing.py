@@ -0,0 +1,60 @@
+import math
+import statistics
+import time
+
+
+class Timer:
+    """Многократный замер времени выполнения функции с прогревом"""
+
+    def __init__(self, repeat=5, warmup=1):
+        """
+        Args:
+            repeat (int): Число замеряемых запусков
+            warmup (int): Число запусков до замеров (не учитываются)
+        """
+        if repeat < 1:
+            raise ValueError("Нужен хотя бы один замеряемый запуск")
+        self.repeat = repeat
+        self.warmup = warmup
+
+    def measure(self, function, *args):
+        """
+        Args:
+            function (callable): Замеряемая функция
+            *args: Ее аргументы
+
+        Returns:
+            tuple: (результат последнего запуска, статистика summarize)
+        """
+        for _ in range(self.warmup):
+            function(*args)
+
+        samples = []
+        result = None
+        for _ in range(self.repeat):
+            start = time.perf_counter_ns()
+            result = function(*args)
+            samples.append(time.perf_counter_ns() - start)
+
+        return result, self.summarize(samples)
+
+    @staticmethod
+    def summarize(samples_ns):
+        """
+        Args:
+            samples_ns (list): Длительности запусков в наносекундах
+
+        Returns:
+            dict: median, p95, stdev, min в секундах и число запусков
+        """
+        ordered = sorted(samples_ns)
+        # p95 по ближайшему рангу: значение, не больше которого 95% замеров
+        p95 = ordered[math.ceil(0.95 * len(ordered)) - 1]
+        stdev = statistics.stdev(ordered) if len(ordered) > 1 else 0
+        return {
+            "median": statistics.median(ordered) / 1e9,
+            "p95": p95 / 1e9,
+            "stdev": stdev / 1e9,
+            "min": ordered[0] / 1e9,
+            "runs": len(ordered),
+        }
@@ -6,19 +6,42 @@ class ResultVisualizer:
     def print_table(self, results):
 
         """Выводит результаты в виде таблицы"""
-        headers = ["Алгоритм", "Исходный размер", "Сжатый размер",
-                   "Коэфф. сжатия", "Экономия", "Время (сек)", "Скорость (КБ/с)"]
+        headers = ["Алгоритм", "Исходный размер", "Сжатый размер", "Коэфф. сжатия", "Экономия",
+                   "Сжатие (сек, медиана)", "p95", "σ", "Скорость сжатия (КБ/с)",
+                   "Распаковка (сек, медиана)", "p95", "σ", "Скорость распаковки (КБ/с)"]
+        memory_headers = ["Пик памяти сжатия (КБ)", "Блоки", "Пик RSS (КБ)",
+                          "Пик памяти распаковки (КБ)", "Блоки", "Пик RSS (КБ)"]
+        with_memory = any("encoding_peak_memory" in metrics for metrics in results.values())
+        if with_memory:
+            headers = headers + memory_headers
 
         table_data = []
         for algo_name, metrics in results.items():
-            table_data.append([
+            if "error" in metrics:
+                table_data.append([algo_name, metrics["error"]] + [""] * (len(headers) - 2))
+                continue
+            row = [
                 algo_name,
                 metrics["original_size"],
                 metrics["encoded_size"],
                 f"{metrics['compression_ratio']:.2f}",
                 f"{metrics['space_saving']} Bit",
-                f"{metrics['encoding_time']:.4f}",
-                f"{metrics['encoding_speed'] / 1024:.2f}"
-            ])
+            ]
+            for prefix in ("encoding", "decoding"):
+                row += [
+                    f"{metrics[prefix + '_time']:.4f}",
+                    f"{metrics[prefix + '_time_p95']:.4f}",
+                    f"{metrics[prefix + '_time_stdev']:.4f}",
+                    f"{metrics[prefix + '_speed'] / 1024:.2f}",
+                ]
+            if with_memory:
+                for prefix in ("encoding", "decoding"):
+                    rss = metrics.get(prefix + "_peak_rss")
+                    row += [
+                        f"{metrics[prefix + '_peak_memory'] / 1024:.1f}",
+                        metrics[prefix + "_blocks"],
+                        "-" if rss is None else f"{rss / 1024:.1f}",
+                    ]
+            table_data.append(row)
 
         print(tabulate(table_data, headers=headers, tablefmt="grid"))